@@ -3,6 +3,16 @@ ASGI config for TellmeMore project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The interview JSON endpoints (start_session, generate_question, submit_answer,
+end_session) are native async views, so serve the project through ASGI to let
+one worker hold many in-flight Gemini calls:
+
+    # development
+    uvicorn TellmeMore.asgi:application --reload
+
+    # production (see Procfile)
+    gunicorn TellmeMore.asgi:application -k uvicorn_worker.UvicornWorker
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
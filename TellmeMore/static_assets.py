@@ -0,0 +1,225 @@
+"""
+Static asset pipeline: build-time hashing and compression, cheap serving.
+
+`manage.py collectstatic` runs OptimizedManifestStorage, which on top of
+Django's content-hashed names and staticfiles.json manifest writes, next to
+every collected file, a WebP re-encode of raster images (<name>.webp) and a
+gzip -9 copy of text assets (<name>.gz), each kept only when it is smaller.
+
+static_files_middleware serves STATIC_ROOT itself. It indexes the directory
+once, then answers each request from memory: it picks the WebP or gzip
+variant from the Accept / Accept-Encoding headers, sends hashed names with a
+one-year immutable Cache-Control, and answers revalidations with 304. When
+collectstatic has not been run, the index is empty and requests pass
+through untouched.
+"""
+import gzip
+import mimetypes
+import os
+import threading
+from io import BytesIO
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.decorators import sync_and_async_middleware
+
+WEBP_SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+GZIP_EXTENSIONS = ('.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ico')
+VARIANT_EXTENSIONS = ('.gz', '.webp')
+MIN_SAVING = 0.05  # a variant must be at least 5% smaller to be worth a Vary header
+GZIP_MIN_BYTES = 256
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+# Unhashed names are served too, but their content changes between deploys
+REVALIDATE_CACHE = 'public, max-age=300'
+MEMORY_CACHE_MAX_BYTES = 2 * 1024 * 1024  # larger files are streamed from disk
+
+
+def webp_variant(data):
+    """WebP re-encode of PNG/JPEG bytes, or None if Pillow cannot make a smaller one"""
+    from PIL import Image, features
+
+    if not features.check('webp'):
+        return None
+    with Image.open(BytesIO(data)) as image:
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        out = BytesIO()
+        image.save(out, 'WEBP', quality=82, method=6)
+    encoded = out.getvalue()
+    return encoded if len(encoded) <= len(data) * (1 - MIN_SAVING) else None
+
+
+def gzip_variant(data):
+    if len(data) < GZIP_MIN_BYTES:
+        return None
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    return compressed if len(compressed) <= len(data) * (1 - MIN_SAVING) else None
+
+
+class OptimizedManifestStorage(ManifestStaticFilesStorage):
+    """Hashed, manifest-backed static storage that also writes .webp and .gz variants"""
+
+    def stored_name(self, name):
+        # Before the first collectstatic there is no manifest; use plain names
+        # rather than failing every page that uses {% static %}
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        # The manifest now maps every original name to its hashed name
+        for name, hashed_name in self.hashed_files.items():
+            if name.endswith(VARIANT_EXTENSIONS):
+                continue
+            self.write_variants(name, {name, hashed_name})
+
+    def write_variants(self, name, targets):
+        lower = name.lower()
+        if lower.endswith(WEBP_SOURCE_EXTENSIONS):
+            make, suffix = webp_variant, '.webp'
+        elif lower.endswith(GZIP_EXTENSIONS):
+            make, suffix = gzip_variant, '.gz'
+        else:
+            return
+        # A hashed CSS file can differ from its original (rewritten urls); anything else is encoded once
+        encoded = {}
+        for target in targets:
+            with self.open(target) as f:
+                data = f.read()
+            if data not in encoded:
+                try:
+                    encoded[data] = make(data)
+                except Exception as e:
+                    print(f"Static variant for {target} failed: {e}")
+                    continue
+            variant = encoded[data]
+            variant_name = target + suffix
+            if self.exists(variant_name):
+                self.delete(variant_name)
+            if variant is not None:
+                self._save(variant_name, ContentFile(variant))
+
+
+class StaticAsset:
+    """One file under STATIC_ROOT and its precomputed variants"""
+
+    def __init__(self, path, immutable):
+        self.path = path
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.cache_control = IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE
+        self.webp_path = path + '.webp' if os.path.exists(path + '.webp') else None
+        self.gzip_path = path + '.gz' if os.path.exists(path + '.gz') else None
+        if self.webp_path:
+            self.vary = 'Accept'
+        elif self.gzip_path:
+            self.vary = 'Accept-Encoding'
+        else:
+            self.vary = None
+        self.etags = {}
+        for variant_path in filter(None, (path, self.webp_path, self.gzip_path)):
+            stat = os.stat(variant_path)
+            self.etags[variant_path] = f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+
+    def choose(self, request):
+        """(path, content type, content encoding) to send for this request"""
+        if self.webp_path and 'image/webp' in request.headers.get('Accept', ''):
+            return self.webp_path, 'image/webp', None
+        if self.gzip_path and 'gzip' in request.headers.get('Accept-Encoding', ''):
+            return self.gzip_path, self.content_type, 'gzip'
+        return self.path, self.content_type, None
+
+    def response(self, request):
+        path, content_type, encoding = self.choose(request)
+        etag = self.etags[path]
+        if request.headers.get('If-None-Match') == etag:
+            response = HttpResponseNotModified()
+        else:
+            data = _read_cached(path)
+            if data is None:
+                response = FileResponse(open(path, 'rb'), content_type=content_type)
+            else:
+                response = HttpResponse(b'' if request.method == 'HEAD' else data, content_type=content_type)
+                response['Content-Length'] = str(len(data))
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Cache-Control'] = self.cache_control
+        if self.vary:
+            response['Vary'] = self.vary
+        return response
+
+
+_file_cache = {}
+_index = None
+_index_lock = threading.Lock()
+
+
+def _read_cached(path):
+    data = _file_cache.get(path)
+    if data is None:
+        if os.path.getsize(path) > MEMORY_CACHE_MAX_BYTES:
+            return None
+        with open(path, 'rb') as f:
+            data = _file_cache[path] = f.read()
+    return data
+
+
+def build_index(root):
+    """{relative url path: StaticAsset} for every collected file under root"""
+    storage = OptimizedManifestStorage(location=root)
+    hashed_names = set(storage.hashed_files.values())
+    index = {}
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            if filename.endswith(VARIANT_EXTENSIONS) or filename == storage.manifest_name:
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            index[name] = StaticAsset(path, immutable=name in hashed_names)
+    return index
+
+
+def get_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                root = settings.STATIC_ROOT
+                _index = build_index(root) if root and os.path.isdir(root) else {}
+    return _index
+
+
+def serve_static(request):
+    """Response for a collected static file, or None to let the request through"""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    prefix = '/' + settings.STATIC_URL.lstrip('/')
+    if not request.path.startswith(prefix):
+        return None
+    asset = get_index().get(request.path[len(prefix):])
+    return asset.response(request) if asset else None
+
+
+@sync_and_async_middleware
+def static_files_middleware(get_response):
+    # Both variants, so async views are not pushed through a thread per request
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            response = serve_static(request)
+            if response is None:
+                response = await get_response(request)
+            return response
+    else:
+        def middleware(request):
+            response = serve_static(request)
+            if response is None:
+                response = get_response(request)
+            return response
+    return middleware
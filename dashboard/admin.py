@@ -1,6 +1,6 @@
 
 from django.contrib import admin
-from .models import InterviewDetails, PresentationPractice, CommunicationPractice, CustomQuestionSet, CustomQuestion , UserProfile 
+from .models import InterviewDetails, PresentationPractice, CommunicationPractice, CustomQuestionSet, CustomQuestion , UserProfile , LLMResponseCache, BackgroundTask, LLMCallLog, BankQuestion, ResumeAnalysis, ResumeParseResult, UserStats
 
 # --- Simple models registration --- #
 admin.site.register(InterviewDetails)
@@ -36,3 +36,68 @@ class CustomQuestionAdmin(admin.ModelAdmin):
 
 #--------------------------------------------------------------------------------
 
+# --- Admin for LLMResponseCache --- #
+@admin.register(LLMResponseCache)
+class LLMResponseCacheAdmin(admin.ModelAdmin):
+    list_display = ('call_site', 'model_name', 'hit_count', 'created_at', 'last_used_at')
+    list_filter = ('call_site', 'model_name')
+    search_fields = ('key',)
+    ordering = ('-last_used_at',)
+
+# --- Admin for BackgroundTask --- #
+@admin.register(BackgroundTask)
+class BackgroundTaskAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'attempts', 'created_at', 'run_after', 'finished_at')
+    list_filter = ('kind', 'status')
+    readonly_fields = ('created_at', 'started_at', 'finished_at')
+
+# --- Admin for LLMCallLog --- #
+@admin.register(LLMCallLog)
+class LLMCallLogAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'call_site', 'duration_ms', 'prompt_tokens', 'completion_tokens', 'cache_status', 'error_class')
+    list_filter = ('call_site', 'cache_status', 'error_class', 'backend')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at',)
+    readonly_fields = [f.name for f in LLMCallLog._meta.fields]
+    show_full_result_count = False  # skip the extra COUNT(*) on a large log
+
+# --- Admin for ResumeParseResult --- #
+@admin.register(ResumeParseResult)
+class ResumeParseResultAdmin(admin.ModelAdmin):
+    # Deleting a timed-out row lets the same file be parsed again
+    list_display = ('sha256', 'status', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('sha256',)
+    readonly_fields = ('sha256', 'status', 'error', 'created_at')
+
+# --- Admin for ResumeAnalysis --- #
+@admin.register(ResumeAnalysis)
+class ResumeAnalysisAdmin(admin.ModelAdmin):
+    list_display = ('parse_result', 'details_sha256', 'created_at')
+    readonly_fields = ('parse_result', 'details_sha256', 'created_at')
+
+# --- Admin for BankQuestion --- #
+@admin.register(BankQuestion)
+class BankQuestionAdmin(admin.ModelAdmin):
+    list_display = ('text', 'mode', 'difficulty', 'domain', 'skill_tag', 'source', 'created_at')
+    list_filter = ('mode', 'difficulty', 'source')
+    search_fields = ('text', 'skill_tag', 'domain')
+    exclude = ('text_hash', 'rand_key')
+    show_full_result_count = False
+
+    def save_model(self, request, obj, form, change):
+        from dashboard.question_bank import make_bank_question
+
+        normalized = make_bank_question(obj.text, obj.mode, obj.difficulty, obj.domain, obj.skill_tag, obj.source)
+        obj.text, obj.domain, obj.skill_tag, obj.text_hash = normalized.text, normalized.domain, normalized.skill_tag, normalized.text_hash
+        if obj.rand_key is None:
+            obj.rand_key = normalized.rand_key
+        super().save_model(request, obj, form, change)
+
+# --- Admin for UserStats --- #
+@admin.register(UserStats)
+class UserStatsAdmin(admin.ModelAdmin):
+    # Maintained by dashboard/user_stats.py; `manage.py rebuild_user_stats` repairs it
+    list_display = ('user', 'session_count', 'scored_session_count', 'best_score', 'total_duration', 'updated_at')
+    search_fields = ('user__username',)
+    readonly_fields = [f.name for f in UserStats._meta.fields]
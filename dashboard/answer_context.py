@@ -0,0 +1,158 @@
+"""
+Bounded answer context for question prompts.
+
+A question prompt carries the last PROMPT_RECENT_ANSWERS answers verbatim and
+a rolling summary of everything older, all inside PROMPT_CONTEXT_TOKENS, so
+its size stays flat however long the session runs. The summary is stored on
+InterviewSession and extended once per submitted answer by the
+'summarize_answers' task, not rebuilt for every question.
+"""
+import re
+
+from django.conf import settings
+
+from dashboard.llm import LLMError, estimate_tokens, get_llm_client
+from dashboard.models import InterviewSession, SessionQuestion
+
+NO_ANSWERS = 'None (first question was about themselves)'
+
+
+def recent_answer_count():
+    return getattr(settings, 'PROMPT_RECENT_ANSWERS', 3)
+
+
+def clip(text, max_tokens):
+    """Collapse whitespace and cut text to roughly max_tokens at a word boundary"""
+    text = " ".join((text or '').split())
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(' ', 1)[0] + '...'
+
+
+def extractive_summary(answers, max_tokens):
+    """First sentence of each answer, clipped; used when no LLM is available"""
+    sentences = []
+    for answer in answers:
+        first = re.split(r'(?<=[.!?])\s', " ".join((answer or '').split()), maxsplit=1)[0]
+        if first:
+            sentences.append(first)
+    return clip(" ".join(sentences), max_tokens)
+
+
+def build_summary_prompt(summary, answers):
+    """Build the prompt that folds older answers into the running summary"""
+    new_answers = "\n".join(f'- "{answer}"' for answer in answers)
+    return f"""
+    You are keeping notes on a candidate during a mock interview.
+
+    Notes so far: {summary or 'None'}
+
+    New answers to fold in:
+    {new_answers}
+
+    Rewrite the notes to cover everything above in at most
+    {getattr(settings, 'PROMPT_SUMMARY_TOKENS', 300) * 3 // 4} words. Keep concrete facts: technologies,
+    projects, roles, numbers and claims worth following up on.
+    Provide ONLY the notes text, no introductions.
+    """
+
+
+def fold_into_summary(summary, answers):
+    """Return summary extended with answers, bounded to PROMPT_SUMMARY_TOKENS"""
+    max_tokens = getattr(settings, 'PROMPT_SUMMARY_TOKENS', 300)
+    client = get_llm_client()
+    if client:
+        try:
+            text = client.generate(build_summary_prompt(summary, answers), call_site='answer_summary')
+            if text.strip():
+                return clip(text, max_tokens)
+        except LLMError as e:
+            print(f"Answer summary failed, using extractive summary: {e}")
+    return clip(f"{summary or ''} {extractive_summary(answers, max_tokens)}".strip(), max_tokens)
+
+
+def update_answer_summary(session_id):
+    """Fold answers that have left the verbatim window into the session summary"""
+    session = InterviewSession.objects.get(id=session_id)
+    answered = SessionQuestion.objects.filter(session=session, user_answer__isnull=False)
+    latest = answered.order_by('-question_number').values_list('question_number', flat=True).first()
+    if latest is None:
+        return False
+
+    through = latest - recent_answer_count()
+    if through <= session.summarized_through:
+        return False
+
+    answers = list(
+        answered
+        .filter(question_number__gt=session.summarized_through, question_number__lte=through)
+        .order_by('question_number')
+        .values_list('user_answer', flat=True)
+    )
+    summary = fold_into_summary(session.answer_summary, answers)
+
+    # Conditional on summarized_through so a concurrent update is not folded in twice
+    return InterviewSession.objects.filter(
+        id=session_id,
+        summarized_through=session.summarized_through,
+    ).update(
+        answer_summary=summary,
+        summarized_through=through,
+    ) == 1
+
+
+def format_answer_context(summary, answers):
+    """Render the summary and newest-first answers within PROMPT_CONTEXT_TOKENS"""
+    budget = getattr(settings, 'PROMPT_CONTEXT_TOKENS', 1000)
+    per_answer = getattr(settings, 'PROMPT_ANSWER_TOKENS', 200)
+
+    parts = []
+    if summary:
+        summary = clip(summary, min(budget, getattr(settings, 'PROMPT_SUMMARY_TOKENS', 300)))
+        parts.append(f"Summary of earlier answers: {summary}")
+        budget -= estimate_tokens(summary)
+
+    recent = []
+    for number, answer in answers:
+        if budget <= 0:
+            break
+        text = clip(answer, min(per_answer, budget))
+        recent.append(f'Answer {number}: "{text}"')
+        budget -= estimate_tokens(text)
+    parts.extend(reversed(recent))
+    return "\n    ".join(parts) if parts else NO_ANSWERS
+
+
+def session_answer_context(session_id, user=None):
+    """Prompt context for a stored session, or None if the session does not exist"""
+    sessions = InterviewSession.objects.filter(id=session_id)
+    if user is not None:
+        sessions = sessions.filter(user=user)
+    session = sessions.values('id', 'answer_summary', 'summarized_through').first()
+    if session is None:
+        return None
+
+    # Recent answers plus any the summary task has not caught up with yet;
+    # the token budget drops the oldest of those if it falls far behind.
+    answers = list(
+        SessionQuestion.objects
+        .filter(
+            session_id=session['id'],
+            user_answer__isnull=False,
+            question_number__gt=session['summarized_through'],
+        )
+        .order_by('-question_number')
+        .values_list('question_number', 'user_answer')[:2 * recent_answer_count()]
+    )
+    return format_answer_context(session['answer_summary'], answers)
+
+
+def client_answer_context(previous_answers):
+    """Prompt context for the answer list a client sent without a session"""
+    previous_answers = [a for a in (previous_answers or []) if isinstance(a, str) and a.strip()]
+    keep = recent_answer_count()
+    older, recent = previous_answers[:-keep], previous_answers[-keep:]
+    summary = extractive_summary(older[-20:], getattr(settings, 'PROMPT_SUMMARY_TOKENS', 300)) if older else ''
+    numbered = [(len(older) + i + 1, answer) for i, answer in enumerate(recent)]
+    return format_answer_context(summary, list(reversed(numbered)))
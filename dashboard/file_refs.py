@@ -0,0 +1,110 @@
+"""
+Reference counts for content-addressed uploads.
+
+Signal handlers keep StoredFile.ref_count equal to the number of model rows
+whose file fields name each blob: +1 when a field starts pointing at it, -1
+when the field changes or the row is deleted. Releasing never deletes the
+file itself; `manage.py gc_uploads` removes blobs that have stayed
+unreferenced for a while.
+
+The row is created by register_blob() as the upload is stored, with the
+upload's own size and hash, before the storage checks whether the file
+already exists. gc_uploads deletes under a lock on that row, so an upload of
+the same content arriving meanwhile either keeps the blob or writes it again.
+
+Files saved before content addressing keep their old names and are not
+counted or collected.
+"""
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+
+from dashboard.models import InterviewDetails, PresentationPractice, StoredFile, UserProfile
+from dashboard.storage import blob_sha256, content_storage, is_blob
+
+CONTENT_ADDRESSED_FIELDS = {
+    InterviewDetails: ['resume_file'],
+    PresentationPractice: ['ppt_file'],
+    UserProfile: ['profile_picture'],
+}
+
+
+def register_blob(name, sha256, size):
+    """Record a blob as it is uploaded, with the upload's own hash and size"""
+    now = timezone.now()
+    # The update waits for a gc_uploads run holding the row lock, and the new
+    # updated_at puts the blob outside the grace period of any later run
+    if not StoredFile.objects.filter(name=name).update(updated_at=now):
+        StoredFile.objects.get_or_create(name=name, defaults={'sha256': sha256, 'size': size, 'updated_at': now})
+
+
+def _stored_size(name):
+    try:
+        return content_storage.size(name)
+    except OSError:
+        return 0
+
+
+def retain(name):
+    if not is_blob(name):
+        return
+    now = timezone.now()
+    if StoredFile.objects.filter(name=name).update(ref_count=F('ref_count') + 1, updated_at=now):
+        return
+    # Uploads register their row when written; only blobs stored before
+    # reference counting get here, and a missing file must not fail the save
+    _, created = StoredFile.objects.get_or_create(
+        name=name,
+        defaults={'sha256': blob_sha256(name), 'size': _stored_size(name), 'ref_count': 1, 'updated_at': now},
+    )
+    if not created:
+        # Another request created the row in between
+        StoredFile.objects.filter(name=name).update(ref_count=F('ref_count') + 1, updated_at=now)
+
+
+def release(name):
+    if not is_blob(name):
+        return
+    StoredFile.objects.filter(name=name, ref_count__gt=0).update(
+        ref_count=F('ref_count') - 1,
+        updated_at=timezone.now(),
+    )
+
+
+def _field_names(instance, fields):
+    # Read the raw attribute: touching a deferred field would cost a query per loaded row
+    names = {}
+    for field in fields:
+        value = instance.__dict__.get(field)
+        names[field] = getattr(value, 'name', value) or None
+    return names
+
+
+def remember_files(sender, instance, **kwargs):
+    instance._stored_files = _field_names(instance, CONTENT_ADDRESSED_FIELDS[sender])
+
+
+def update_file_refs(sender, instance, update_fields=None, **kwargs):
+    fields = CONTENT_ADDRESSED_FIELDS[sender]
+    if update_fields is not None:
+        fields = [field for field in fields if field in update_fields]
+    previous = getattr(instance, '_stored_files', {})
+    current = _field_names(instance, fields)
+    for field, name in current.items():
+        old = previous.get(field)
+        if name != old:
+            retain(name)
+            release(old)
+    instance._stored_files = {**previous, **current}
+
+
+def release_file_refs(sender, instance, **kwargs):
+    for name in _field_names(instance, CONTENT_ADDRESSED_FIELDS[sender]).values():
+        release(name)
+
+
+def connect():
+    for model in CONTENT_ADDRESSED_FIELDS:
+        post_init.connect(remember_files, sender=model, dispatch_uid=f'file_refs_init_{model.__name__}')
+        post_save.connect(update_file_refs, sender=model, dispatch_uid=f'file_refs_save_{model.__name__}')
+        post_delete.connect(release_file_refs, sender=model, dispatch_uid=f'file_refs_delete_{model.__name__}')
@@ -0,0 +1,80 @@
+"""
+Run untrusted file parsers in short-lived child processes.
+
+A malformed PDF or Office file can keep a parser busy for minutes or grow
+without bound, so run_isolated() calls the parser in its own process started
+from a forkserver, caps the child's address space, and kills it once the
+wall-clock timeout passes. A process per call, rather than a long-lived pool,
+is what makes the kill safe: a pool cannot stop one stuck task without
+breaking the others.
+
+Targets must be top-level functions in modules that import without Django
+being set up (dashboard/resume_extraction.py, dashboard/slide_extraction.py),
+because the child does not configure Django.
+"""
+import multiprocessing
+
+
+def _mp_context():
+    # forkserver children start from a clean, single-threaded process; fork
+    # from a threaded web worker is unsafe
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _child_entry(conn, target, args, memory_limit):
+    """Child process entry point: send ('ok', result) or ('error', message)"""
+    try:
+        if memory_limit:
+            try:
+                import resource
+                resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+            except (ImportError, ValueError, OSError):
+                pass  # not enforceable on this platform
+        conn.send(('ok', target(*args)))
+    except MemoryError:
+        conn.send(('error', "Parser needed more memory than allowed"))
+    except Exception as e:
+        conn.send(('error', f"{e.__class__.__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def run_isolated(target, *args, timeout, memory_mb=None, slots=None):
+    """Return (status, result) of target(*args) run in a child process.
+
+    status is 'ok', 'timeout' or 'error' for what the parser did with the
+    input, or 'busy' (no slot came free) or 'crashed' (the child died without
+    reporting) when the outcome says nothing about the input; for all but
+    'ok', result is a message. slots, a semaphore, bounds how many children
+    run at once.
+    """
+    if slots is not None and not slots.acquire(timeout=timeout):
+        return 'busy', "All parser processes are busy"
+    try:
+        ctx = _mp_context()
+        receiver, sender = ctx.Pipe(duplex=False)
+        process = ctx.Process(
+            target=_child_entry,
+            args=(sender, target, args, memory_mb * 1024 * 1024 if memory_mb else None),
+            daemon=True,
+        )
+        process.start()
+        sender.close()
+        try:
+            if receiver.poll(timeout):
+                status, result = receiver.recv()
+            else:
+                status, result = 'timeout', f"Parsing took longer than {timeout}s"
+        except EOFError:
+            # The child died without reporting, e.g. killed for exceeding its memory limit
+            status, result = 'crashed', "Parser exited unexpectedly"
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.kill()
+            process.join()
+        return status, result
+    finally:
+        if slots is not None:
+            slots.release()
@@ -0,0 +1,467 @@
+"""
+LLM client layer for the dashboard.
+
+Views never talk to google.generativeai directly. They ask get_llm_client()
+for the configured backend and call generate() with a call site name, so the
+provider, timeouts and transport can change without touching the views.
+
+Backends are selected with settings.LLM_BACKEND:
+    "gemini" - Google Gemini over a pooled gRPC/REST transport (default)
+    "stub"   - deterministic in-process responses, no network access
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from dashboard.llm_metrics import record_call
+
+
+class LLMError(Exception):
+    """Raised when a backend call fails"""
+
+
+class LLMTimeout(LLMError):
+    """Raised when a backend call exceeds its deadline"""
+
+
+class LLMUnavailable(LLMError):
+    """Raised without calling the backend: the circuit is open or the worker is at its call limit"""
+
+
+class CircuitBreaker:
+    """Stops calls to a failing backend for a while instead of letting them pile up.
+
+    Opens after failure_threshold consecutive failures. Once reset_timeout has
+    passed, a single probe call is let through; its success closes the circuit,
+    its failure opens it for another reset_timeout.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def is_open(self):
+        """True while calls are being refused (a due probe counts as closed)"""
+        opened_at = self.opened_at
+        return opened_at is not None and (self.probing or time.monotonic() - opened_at < self.reset_timeout)
+
+    def allow(self):
+        """Admit a call, claiming the probe slot if the circuit is due for one"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.probing = True
+            return True
+
+    def cancel_probe(self):
+        with self._lock:
+            self.probing = False
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                print("LLM circuit closed")
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    print(f"LLM circuit opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+class LLMClient:
+    """Interface shared by every LLM backend.
+
+    The public methods admit each call through the circuit breaker and the
+    per-process concurrency limit, time it and record it with record_call();
+    backends implement _generate/_agenerate/_astream, which take the resolved
+    deadline and fill `usage` with token counts when the provider reports them.
+    """
+
+    backend = None
+
+    def __init__(self, model_name, timeout, max_concurrent=8, breaker=None):
+        self.model_name = model_name
+        self.timeout = timeout
+        self.max_concurrent = max_concurrent
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, reset_timeout=30)
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    def available(self):
+        """False while the circuit is open; callers use it to go straight to their fallback"""
+        return not self.breaker.is_open()
+
+    @contextmanager
+    def _guard(self, call_site):
+        # Refuse immediately rather than queueing: a caller waiting on a slot
+        # is exactly the pile-up the limit exists to prevent.
+        if not self.breaker.allow():
+            raise LLMUnavailable(f"{call_site} skipped: AI service circuit is open")
+        if not self._slots.acquire(blocking=False):
+            self.breaker.cancel_probe()
+            raise LLMUnavailable(f"{call_site} skipped: {self.max_concurrent} AI calls already in flight")
+        settled = False
+        try:
+            yield
+        except LLMError:
+            self.breaker.record_failure()
+            settled = True
+            raise
+        else:
+            self.breaker.record_success()
+            settled = True
+        finally:
+            if not settled:
+                # Cancelled, or failed with something other than LLMError: a probe
+                # that never reported must not keep the circuit open for good
+                self.breaker.cancel_probe()
+            self._slots.release()
+
+    def generate(self, prompt, call_site, timeout=None, json_output=False):
+        """Return the completion text for prompt, raising LLMError on failure.
+
+        With json_output the backend is asked for a bare JSON document.
+        """
+        started, usage, text, error = time.monotonic(), {}, None, None
+        try:
+            with self._guard(call_site):
+                text = self._generate(prompt, call_site, timeout or self.timeout, json_output, usage)
+            return text
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record(call_site, started, prompt, text, usage, error)
+
+    async def agenerate(self, prompt, call_site, timeout=None, json_output=False):
+        """Async variant of generate()"""
+        started, usage, text, error = time.monotonic(), {}, None, None
+        try:
+            with self._guard(call_site):
+                text = await self._agenerate(prompt, call_site, timeout or self.timeout, json_output, usage)
+            return text
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record(call_site, started, prompt, text, usage, error)
+
+    async def astream(self, prompt, call_site, timeout=None):
+        """Yield the completion in chunks as the backend produces them"""
+        started, usage, chunks, error = time.monotonic(), {}, [], None
+        try:
+            with self._guard(call_site):
+                async for chunk in self._astream(prompt, call_site, timeout or self.timeout, usage):
+                    chunks.append(chunk)
+                    yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record(call_site, started, prompt, "".join(chunks), usage, error)
+
+    def _generate(self, prompt, call_site, deadline, json_output, usage):
+        raise NotImplementedError
+
+    async def _agenerate(self, prompt, call_site, deadline, json_output, usage):
+        # Backends without a native async call run the sync one off the event loop
+        return await sync_to_async(self._generate, thread_sensitive=False)(
+            prompt, call_site, deadline, json_output, usage
+        )
+
+    async def _astream(self, prompt, call_site, deadline, usage):
+        yield await self._agenerate(prompt, call_site, deadline, False, usage)
+
+    def _record(self, call_site, started, prompt, text, usage, error):
+        record_call(
+            call_site=call_site,
+            backend=self.backend,
+            model_name=self.model_name,
+            duration_ms=(time.monotonic() - started) * 1000,
+            prompt_tokens=usage.get('prompt_tokens', estimate_tokens(prompt)),
+            completion_tokens=usage.get('completion_tokens', estimate_tokens(text) if text else 0),
+            error=error,
+        )
+
+
+def estimate_tokens(text):
+    """Rough token count for backends that report none; about four characters per token"""
+    return len(text or '') // 4 + 1
+
+
+def _gemini_usage(response, usage):
+    metadata = getattr(response, 'usage_metadata', None)
+    if metadata and metadata.prompt_token_count:
+        usage['prompt_tokens'] = metadata.prompt_token_count
+        usage['completion_tokens'] = metadata.candidates_token_count
+
+
+class GeminiClient(LLMClient):
+    """Gemini backend with a per-worker pooled transport and per-call deadlines"""
+
+    backend = "gemini"
+
+    def __init__(self, model_name, timeout, api_key, transport, **limits):
+        super().__init__(model_name, timeout, **limits)
+        import google.generativeai as genai
+
+        # genai keeps one service client (and its channel/session pool) per
+        # process once configured, so every call from this worker reuses it.
+        genai.configure(api_key=api_key, transport=transport)
+        self._model = genai.GenerativeModel(model_name)
+        self._api_key = api_key
+        self._async_models = weakref.WeakKeyDictionary()
+
+    def _generate(self, prompt, call_site, deadline, json_output, usage):
+        from google.api_core import exceptions as api_exceptions
+
+        try:
+            response = self._model.generate_content(
+                prompt,
+                generation_config=self._generation_config(json_output),
+                request_options={'timeout': deadline},
+            )
+            _gemini_usage(response, usage)
+            return response.text
+        except api_exceptions.DeadlineExceeded as e:
+            raise LLMTimeout(f"{call_site} call exceeded {deadline}s deadline") from e
+        except Exception as e:
+            raise LLMError(f"{call_site} call failed: {e}") from e
+
+    def _generation_config(self, json_output):
+        return {'response_mime_type': 'application/json'} if json_output else None
+
+    def _async_model(self):
+        # grpc.aio channels are bound to the event loop that created them, and
+        # the process-wide genai client uses the sync transport, so keep one
+        # async model per running loop (a single one under uvicorn).
+        loop = asyncio.get_running_loop()
+        model = self._async_models.get(loop)
+        if model is None:
+            import google.generativeai as genai
+            from google.ai import generativelanguage as glm
+
+            model = genai.GenerativeModel(self.model_name)
+            model._async_client = glm.GenerativeServiceAsyncClient(
+                transport='grpc_asyncio',
+                client_options={'api_key': self._api_key},
+            )
+            self._async_models[loop] = model
+        return model
+
+    async def _agenerate(self, prompt, call_site, deadline, json_output, usage):
+        from google.api_core import exceptions as api_exceptions
+
+        try:
+            response = await asyncio.wait_for(
+                self._async_model().generate_content_async(
+                    prompt,
+                    generation_config=self._generation_config(json_output),
+                    request_options={'timeout': deadline},
+                ),
+                deadline,
+            )
+            _gemini_usage(response, usage)
+            return response.text
+        except (api_exceptions.DeadlineExceeded, asyncio.TimeoutError) as e:
+            raise LLMTimeout(f"{call_site} call exceeded {deadline}s deadline") from e
+        except Exception as e:
+            raise LLMError(f"{call_site} call failed: {e}") from e
+
+    async def _astream(self, prompt, call_site, deadline, usage):
+        from google.api_core import exceptions as api_exceptions
+
+        try:
+            response = await asyncio.wait_for(
+                self._async_model().generate_content_async(
+                    prompt,
+                    stream=True,
+                    request_options={'timeout': deadline},
+                ),
+                deadline,
+            )
+            async for chunk in response:
+                # The last chunk carries the usage totals for the whole stream
+                _gemini_usage(chunk, usage)
+                yield chunk.text
+        except (api_exceptions.DeadlineExceeded, asyncio.TimeoutError) as e:
+            raise LLMTimeout(f"{call_site} stream exceeded {deadline}s deadline") from e
+        except Exception as e:
+            raise LLMError(f"{call_site} stream failed: {e}") from e
+
+
+class StubClient(LLMClient):
+    """Deterministic in-process backend for local development and benchmarks"""
+
+    backend = "stub"
+
+    RESPONSES = {
+        'question': "Can you describe a situation where you had to apply your core skills to solve a difficult problem? (ref {digest})",
+        'eval': "You gave a clear and relevant answer. Add a concrete example with measurable results to make it stronger. (ref {digest})",
+        'simple_feedback': (
+            "What you did well: your answer was structured and on topic.\n"
+            "Areas for improvement: add specific examples and outcomes.\n"
+            "Suggestion: use the STAR method to organise your story.\n"
+            "Rating: 7/10 (ref {digest})"
+        ),
+        'resume': (
+            "PROFESSIONAL SUMMARY:\nCandidate with a solid technical foundation. (ref {digest})\n\n"
+            "KEY STRENGTHS:\n- Problem solving\n- Communication\n- Teamwork\n\n"
+            "EXPERIENCE HIGHLIGHTS:\n- Academic and personal projects\n\n"
+            "SUGGESTED INTERVIEW FOCUS AREAS:\n- Core skills\n- Project experience\n- Behavioural questions"
+        ),
+    }
+
+    def __init__(self, model_name, timeout, latency=0.0, **limits):
+        super().__init__(model_name, timeout, **limits)
+        self.latency = latency
+
+    def _generate(self, prompt, call_site, deadline, json_output, usage):
+        if self.latency:
+            if self.latency > deadline:
+                time.sleep(deadline)
+                raise LLMTimeout(f"{call_site} call exceeded {deadline}s deadline")
+            time.sleep(self.latency)
+        return self._respond(prompt, call_site)
+
+    async def _agenerate(self, prompt, call_site, deadline, json_output, usage):
+        if self.latency:
+            if self.latency > deadline:
+                await asyncio.sleep(deadline)
+                raise LLMTimeout(f"{call_site} call exceeded {deadline}s deadline")
+            await asyncio.sleep(self.latency)
+        return self._respond(prompt, call_site)
+
+    async def _astream(self, prompt, call_site, deadline, usage):
+        chunks = re.findall(r'\S+\s*', self._respond(prompt, call_site))
+        for chunk in chunks:
+            if self.latency:
+                await asyncio.sleep(self.latency / len(chunks))
+            yield chunk
+
+    def _respond(self, prompt, call_site):
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8]
+        if call_site == 'session_eval':
+            return self._session_eval_response(prompt, digest)
+        if call_site == 'question_plan':
+            return self._question_plan_response(prompt, digest)
+        template = self.RESPONSES.get(call_site, "Stub response for {call_site}. (ref {digest})")
+        return template.format(digest=digest, call_site=call_site)
+
+    def _session_eval_response(self, prompt, digest):
+        # Score every "Question #N" in the prompt, deterministically per prompt
+        seed = int(digest, 16)
+        numbers = sorted({int(n) for n in re.findall(r'Question #(\d+)', prompt)})
+        questions = [
+            {
+                'question_number': n,
+                'relevance_score': 60 + (seed + n) % 35,
+                'clarity_score': 55 + (seed + 2 * n) % 40,
+                'completeness_score': 50 + (seed + 3 * n) % 45,
+                'improvement_areas': ['specific_examples'] if n % 2 else ['structure'],
+                'feedback': f"Answer {n} is on topic; add one concrete example. (ref {digest})",
+            }
+            for n in numbers
+        ]
+        return json.dumps({
+            'questions': questions,
+            'overall_confidence_score': 70 + seed % 20,
+            'communication_score': 65 + seed % 25,
+            'technical_score': 60 + seed % 30,
+            'session_feedback': f"Solid session overall. Focus on concrete, measurable examples. (ref {digest})",
+        })
+
+    PLAN_TOPICS = [
+        "a project you are proud of and the part you owned",
+        "a time a deadline was at risk and what you changed",
+        "how you would find the cause of an intermittent failure",
+        "a disagreement with a teammate and how it was resolved",
+        "the trade-offs you weighed in a recent design decision",
+        "something you learned recently and how you applied it",
+        "how you make sure your work is correct before shipping it",
+        "a piece of feedback that changed how you work",
+        "how you would explain your main skill to a newcomer",
+        "what you would improve first in your last team's process",
+    ]
+
+    def _question_plan_response(self, prompt, digest):
+        match = re.search(r'exactly (\d+)', prompt)
+        count = int(match.group(1)) if match else 5
+        offset = int(digest, 16) % len(self.PLAN_TOPICS)
+        questions = [
+            f"Tell me about {self.PLAN_TOPICS[(offset + n) % len(self.PLAN_TOPICS)]}. (ref {digest})"
+            for n in range(count)
+        ]
+        return json.dumps({'questions': questions})
+
+
+def _build_client():
+    backend = getattr(settings, 'LLM_BACKEND', 'gemini')
+    model_name = getattr(settings, 'LLM_MODEL_NAME', 'gemini-2.0-flash')
+    timeout = getattr(settings, 'LLM_TIMEOUT_SECONDS', 20)
+    limits = {
+        'max_concurrent': getattr(settings, 'LLM_MAX_CONCURRENT_CALLS', 8),
+        'breaker': CircuitBreaker(
+            failure_threshold=getattr(settings, 'LLM_BREAKER_FAILURES', 5),
+            reset_timeout=getattr(settings, 'LLM_BREAKER_RESET_SECONDS', 30),
+        ),
+    }
+
+    if backend == 'stub':
+        return StubClient(model_name, timeout, latency=getattr(settings, 'LLM_STUB_LATENCY_SECONDS', 0.0), **limits)
+    if backend == 'gemini':
+        return GeminiClient(
+            model_name,
+            timeout,
+            api_key=settings.GEMINI_API_KEY,
+            transport=getattr(settings, 'LLM_TRANSPORT', 'grpc'),
+            **limits,
+        )
+    raise ValueError(f"Unknown LLM_BACKEND: {backend}")
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client():
+    """Return this worker's LLM client, or None if the backend is unavailable.
+
+    The client is built lazily and rebuilt after a fork, so gunicorn workers
+    never share a gRPC channel created in the master process.
+    """
+    global _client, _client_pid
+
+    pid = os.getpid()
+    if _client_pid != pid:
+        with _client_lock:
+            if _client_pid != pid:
+                try:
+                    _client = _build_client()
+                except Exception as e:
+                    _client = None
+                    print(f"LLM client configuration failed: {e}")
+                _client_pid = pid
+    return _client
@@ -0,0 +1,172 @@
+"""
+Response cache for LLM calls, shared by every worker through the database.
+
+Entries are keyed on the backend, model name, prompt template version and
+the normalized inputs of the call, expire after LLM_CACHE_TTL_SECONDS and
+are evicted least-recently-used first once LLM_CACHE_MAX_ENTRIES is exceeded.
+"""
+import hashlib
+import json
+import random
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from dashboard.llm_metrics import cache_status, record_call
+from dashboard.models import LLMResponseCache
+
+# Bump a version when its prompt template changes so stale entries stop matching.
+PROMPT_VERSIONS = {
+    'resume': 1,
+    'eval': 1,
+    'simple_feedback': 1,
+}
+
+
+def normalize_inputs(value):
+    """Collapse whitespace in every string so cosmetic edits share a cache entry"""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): normalize_inputs(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_inputs(v) for v in value]
+    return value
+
+
+def make_cache_key(client, call_site, inputs):
+    payload = json.dumps({
+        'backend': client.backend,
+        'model': client.model_name,
+        'call_site': call_site,
+        'version': PROMPT_VERSIONS.get(call_site, 1),
+        'inputs': normalize_inputs(inputs),
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get_cached_response(key):
+    """Return the cached text for key, or None on a miss or expired entry"""
+    ttl = timedelta(seconds=getattr(settings, 'LLM_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+    now = timezone.now()
+    text = (
+        LLMResponseCache.objects
+        .filter(key=key, created_at__gte=now - ttl)
+        .values_list('response_text', flat=True)
+        .first()
+    )
+    if text is not None:
+        LLMResponseCache.objects.filter(key=key).update(
+            hit_count=F('hit_count') + 1,
+            last_used_at=now,
+        )
+    return text
+
+
+def store_response(key, client, call_site, text):
+    try:
+        LLMResponseCache.objects.update_or_create(
+            key=key,
+            defaults={
+                'call_site': call_site,
+                'model_name': client.model_name,
+                'response_text': text,
+                'created_at': timezone.now(),
+                'last_used_at': timezone.now(),
+                'hit_count': 0,
+            },
+        )
+    except IntegrityError:
+        # Another worker stored the same response first
+        return
+
+    cull_frequency = getattr(settings, 'LLM_CACHE_CULL_FREQUENCY', 20)
+    if random.randint(1, cull_frequency) == 1:
+        evict_entries()
+
+
+def evict_entries():
+    """Delete expired entries, then the least recently used ones above the size limit"""
+    ttl = timedelta(seconds=getattr(settings, 'LLM_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+    max_entries = getattr(settings, 'LLM_CACHE_MAX_ENTRIES', 5000)
+
+    deleted, _ = LLMResponseCache.objects.filter(created_at__lt=timezone.now() - ttl).delete()
+
+    cutoff = (
+        LLMResponseCache.objects
+        .order_by('-last_used_at')
+        .values_list('last_used_at', flat=True)[max_entries:max_entries + 1]
+    )
+    if cutoff:
+        lru_deleted, _ = LLMResponseCache.objects.filter(last_used_at__lte=cutoff[0]).delete()
+        deleted += lru_deleted
+    return deleted
+
+
+def record_hit(client, call_site, started):
+    record_call(
+        call_site=call_site,
+        backend=client.backend,
+        model_name=client.model_name,
+        duration_ms=(time.monotonic() - started) * 1000,
+        prompt_tokens=0,
+        completion_tokens=0,
+        cache='hit',
+    )
+
+
+def cached_generate(client, prompt, call_site, inputs, timeout=None):
+    """Serve a cached response for these inputs, or generate and store one"""
+    started = time.monotonic()
+    try:
+        key = make_cache_key(client, call_site, inputs)
+        text = get_cached_response(key)
+    except Exception as e:
+        print(f"LLM cache lookup failed: {e}")
+        return client.generate(prompt, call_site, timeout=timeout)
+
+    if text is not None:
+        record_hit(client, call_site, started)
+        return text
+
+    status = cache_status.set('miss')
+    try:
+        text = client.generate(prompt, call_site, timeout=timeout)
+    finally:
+        cache_status.reset(status)
+    try:
+        store_response(key, client, call_site, text)
+    except Exception as e:
+        print(f"LLM cache store failed: {e}")
+    return text
+
+
+async def acached_generate(client, prompt, call_site, inputs, timeout=None):
+    """Async variant of cached_generate() for the ASGI views"""
+    started = time.monotonic()
+    try:
+        key = make_cache_key(client, call_site, inputs)
+        text = await sync_to_async(get_cached_response)(key)
+    except Exception as e:
+        print(f"LLM cache lookup failed: {e}")
+        return await client.agenerate(prompt, call_site, timeout=timeout)
+
+    if text is not None:
+        record_hit(client, call_site, started)
+        return text
+
+    status = cache_status.set('miss')
+    try:
+        text = await client.agenerate(prompt, call_site, timeout=timeout)
+    finally:
+        cache_status.reset(status)
+    try:
+        await sync_to_async(store_response)(key, client, call_site, text)
+    except Exception as e:
+        print(f"LLM cache store failed: {e}")
+    return text
@@ -0,0 +1,119 @@
+"""
+Per-call LLM instrumentation.
+
+Every LLM call (and every response served from the cache) is recorded as an
+LLMCallLog row with its call site, wall time, token counts, cache status and
+error class. Rows are buffered in memory and written with bulk_create by a
+background thread, every LLM_CALL_LOG_FLUSH_SECONDS or as soon as
+LLM_CALL_LOG_BATCH_SIZE rows are waiting, so requests never wait on the log.
+"""
+import atexit
+import contextvars
+import os
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from dashboard.models import LLMCallLog
+
+# Set by the response cache around a client call it makes after a miss
+cache_status = contextvars.ContextVar('llm_cache_status', default='none')
+
+
+class CallLogWriter:
+    """Buffers LLMCallLog rows and writes them in batches from a daemon thread"""
+
+    def __init__(self, batch_size, flush_interval):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def add(self, entry):
+        with self._lock:
+            self._buffer.append(entry)
+            full = len(self._buffer) >= self.batch_size
+        if self._thread is None:
+            self._start()
+        if full:
+            self._wake.set()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='llm-call-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write everything buffered so far; returns the number of rows written"""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        try:
+            close_old_connections()
+            LLMCallLog.objects.bulk_create(batch)
+        except Exception as e:
+            # Instrumentation must never take a request down with it
+            print(f"LLM call log flush failed, dropped {len(batch)} rows: {e}")
+            return 0
+        return len(batch)
+
+
+_writer = None
+_writer_pid = None
+_writer_lock = threading.Lock()
+
+
+def get_call_log_writer():
+    """Return this process's writer, building a fresh one after a fork"""
+    global _writer, _writer_pid
+
+    pid = os.getpid()
+    if _writer_pid != pid:
+        with _writer_lock:
+            if _writer_pid != pid:
+                _writer = CallLogWriter(
+                    batch_size=getattr(settings, 'LLM_CALL_LOG_BATCH_SIZE', 50),
+                    flush_interval=getattr(settings, 'LLM_CALL_LOG_FLUSH_SECONDS', 5),
+                )
+                _writer_pid = pid
+    return _writer
+
+
+def flush_call_log():
+    if _writer is not None and _writer_pid == os.getpid():
+        return _writer.flush()
+    return 0
+
+
+atexit.register(flush_call_log)
+
+
+def record_call(call_site, backend, model_name, duration_ms, prompt_tokens=None,
+                completion_tokens=None, error=None, cache=None):
+    """Queue one LLMCallLog row; cache defaults to the status set by the response cache"""
+    if not getattr(settings, 'LLM_CALL_LOG', True):
+        return
+    get_call_log_writer().add(LLMCallLog(
+        call_site=call_site,
+        backend=backend or '',
+        model_name=model_name or '',
+        created_at=timezone.now(),
+        duration_ms=round(duration_ms, 1),
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        cache_status=cache or cache_status.get(),
+        error_class=error.__class__.__name__ if error else None,
+    ))
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.models import InterviewSession, SessionAnalytics, SessionQuestion
+from dashboard.session_analytics import hesitation_count, word_count
+
+FIELDS = [
+    'answer_count', 'response_time_total', 'average_response_time', 'longest_response_time',
+    'shortest_response_time', 'word_count_total', 'avg_words_per_answer', 'hesitation_count',
+]
+
+
+class Command(BaseCommand):
+    help = "Rebuild SessionAnalytics running totals from stored answers, in keyset-paginated batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Sessions per pass")
+        parser.add_argument('--only-missing', action='store_true', help="Skip sessions that already have analytics")
+
+    def handle(self, *args, **options):
+        sessions = InterviewSession.objects.all()
+        if options['only_missing']:
+            sessions = sessions.filter(sessionanalytics__isnull=True)
+
+        total, last_id = 0, 0
+        while True:
+            session_ids = list(
+                sessions.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:options['batch_size']]
+            )
+            if not session_ids:
+                break
+            last_id = session_ids[-1]
+
+            stats = {session_id: SessionAnalytics(session_id=session_id) for session_id in session_ids}
+            answers = (
+                SessionQuestion.objects
+                .filter(session_id__in=session_ids, user_answer__isnull=False)
+                .values_list('session_id', 'user_answer', 'time_taken_seconds')
+            )
+            for session_id, answer, seconds in answers.iterator():
+                row = stats[session_id]
+                seconds = float(seconds or 0)
+                row.shortest_response_time = seconds if not row.answer_count else min(row.shortest_response_time, seconds)
+                row.longest_response_time = max(row.longest_response_time, seconds)
+                row.answer_count += 1
+                row.response_time_total += seconds
+                row.word_count_total += word_count(answer)
+                row.hesitation_count += hesitation_count(answer)
+
+            for row in stats.values():
+                if row.answer_count:
+                    row.average_response_time = row.response_time_total / row.answer_count
+                    row.avg_words_per_answer = row.word_count_total / row.answer_count
+
+            SessionAnalytics.objects.bulk_create(
+                stats.values(),
+                update_conflicts=True,
+                unique_fields=['session'],
+                update_fields=FIELDS,
+            )
+            total += len(stats)
+        self.stdout.write(f"Backfilled analytics for {total} sessions")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.models import UserProfile
+from dashboard.thumbnails import make_thumbnails
+
+
+class Command(BaseCommand):
+    help = "Create avatar variants for profile pictures that have none (e.g. uploaded before thumbnails existed)"
+
+    def handle(self, *args, **options):
+        built = failed = 0
+        profiles = UserProfile.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+        for profile in profiles.filter(profile_thumbnails={}).only('id', 'profile_picture').iterator():
+            try:
+                thumbnails = make_thumbnails(profile.profile_picture)
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Profile {profile.id}: {e}")
+                continue
+            if thumbnails:
+                UserProfile.objects.filter(id=profile.id).update(profile_thumbnails=thumbnails)
+                built += 1
+        # Pictures stored before content addressing are skipped; re-uploading them creates variants
+        self.stdout.write(f"Created thumbnails for {built} profiles ({failed} failed)")
@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.utils import timezone
+from datetime import timedelta
+
+from dashboard.models import InterviewDetails, InterviewSession, SessionQuestion
+
+
+class Command(BaseCommand):
+    help = "Print the database's query plans for the session hot-path queries (run before and after migrating to compare)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Username whose data the queries use (default: the user with most sessions)")
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            user = User.objects.annotate(n=Count('interviewsession')).order_by('-n').first()
+        if user is None:
+            raise CommandError("No such user")
+        session = InterviewSession.objects.filter(user=user).order_by('-id').first()
+        session_id = session.id if session else 0
+
+        queries = {
+            'analytics: recent sessions': (
+                InterviewSession.objects.filter(user=user).order_by('-started_at')[:5]
+            ),
+            'analytics series: sessions since': (
+                InterviewSession.objects.filter(user=user, started_at__gte=timezone.now() - timedelta(days=30))
+            ),
+            'stats: best score': (
+                InterviewSession.objects
+                .filter(user=user, overall_confidence_score__isnull=False)
+                .order_by('-overall_confidence_score')
+                .values('overall_confidence_score')[:1]
+            ),
+            'submit_answer: session': InterviewSession.objects.filter(id=session_id, user=user),
+            'submit_answer: question': SessionQuestion.objects.filter(session_id=session_id, question_number=1),
+            'generate_question: interview details': InterviewDetails.objects.filter(user=user),
+        }
+        for label, queryset in queries.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(queryset.explain())
+            self.stdout.write("")
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from dashboard.models import StoredFile
+from dashboard.storage import content_storage
+
+
+class Command(BaseCommand):
+    help = "Show content-addressed upload statistics and delete blobs no model references any more"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age-hours', type=float, default=24,
+                            help="Only delete blobs unreferenced for at least this long")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['min_age_hours'])
+        deleted = freed = 0
+        for name in StoredFile.objects.filter(ref_count=0, updated_at__lt=cutoff).values_list('name', flat=True):
+            with transaction.atomic():
+                # Re-check under the row lock: the blob may have been uploaded again meanwhile
+                stored = StoredFile.objects.select_for_update().filter(name=name, ref_count=0, updated_at__lt=cutoff).first()
+                if stored is None:
+                    continue
+                if not options['dry_run']:
+                    content_storage.delete(name)
+                    content_storage.delete_derived(name)
+                    stored.delete()
+            deleted += 1
+            freed += stored.size
+
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(f"{verb} {deleted} unreferenced blobs ({freed / 1024 / 1024:.1f} MB)")
+
+        totals = StoredFile.objects.aggregate(
+            blobs=Count('name'),
+            refs=Sum('ref_count'),
+            stored=Sum('size'),
+            # bytes that one copy per reference would have taken beyond the single stored copy
+            saved=Sum(F('size') * (F('ref_count') - 1), filter=Q(ref_count__gt=1)),
+        )
+        self.stdout.write(
+            f"{totals['blobs']} blobs, {totals['refs'] or 0} references, "
+            f"{(totals['stored'] or 0) / 1024 / 1024:.1f} MB stored, "
+            f"{(totals['saved'] or 0) / 1024 / 1024:.1f} MB saved by deduplication"
+        )
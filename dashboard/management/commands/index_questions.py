@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.models import QuestionSignature, SessionQuestion
+from dashboard.similarity import minhash
+
+
+class Command(BaseCommand):
+    help = "Store near-duplicate signatures for session questions that have none (e.g. asked before indexing existed)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        missing = (
+            SessionQuestion.objects
+            .filter(signature__isnull=True)
+            .order_by('id')
+            .values_list('id', 'session__user_id', 'question_text')
+        )
+        total = 0
+        while True:
+            rows = list(missing[:options['batch_size']])
+            if not rows:
+                break
+            QuestionSignature.objects.bulk_create([
+                QuestionSignature(user_id=user_id, session_question_id=question_id, signature=minhash(text))
+                for question_id, user_id, text in rows
+            ])
+            total += len(rows)
+        self.stdout.write(f"Indexed {total} questions")
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Sum
+
+from dashboard.llm_cache import evict_entries
+from dashboard.models import LLMResponseCache
+
+
+class Command(BaseCommand):
+    help = "Show LLM response cache statistics per call site, or evict/clear entries"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--evict', action='store_true', help="Delete expired and least recently used entries")
+        parser.add_argument('--clear', action='store_true', help="Delete every cached response")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted, _ = LLMResponseCache.objects.all().delete()
+            self.stdout.write(f"Cleared {deleted} cache entries")
+            return
+        if options['evict']:
+            self.stdout.write(f"Evicted {evict_entries()} cache entries")
+
+        rows = (
+            LLMResponseCache.objects
+            .values('call_site')
+            .annotate(entries=Count('key'), hits=Sum('hit_count'))
+            .order_by('call_site')
+        )
+        self.stdout.write(f"{'call site':<20}{'entries':>10}{'hits':>10}{'hit rate':>10}")
+        for row in rows:
+            # every entry was stored by exactly one miss
+            lookups = row['entries'] + row['hits']
+            hit_rate = row['hits'] / lookups * 100 if lookups else 0
+            self.stdout.write(f"{row['call_site']:<20}{row['entries']:>10}{row['hits']:>10}{hit_rate:>9.1f}%")
@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dashboard.llm_metrics import flush_call_log
+from dashboard.models import LLMCallLog
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-pct * len(sorted_values) // 100))  # ceil(pct/100 * n)
+    return sorted_values[int(rank) - 1]
+
+
+class Command(BaseCommand):
+    help = "Report LLM call latency (p50/p95/p99), tokens, cache hits and errors per call site"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float, default=24, help="Size of the reporting window (default 24)")
+        parser.add_argument('--call-site', help="Only report this call site")
+        parser.add_argument('--prune-days', type=int, help="Delete log rows older than this many days first")
+
+    def handle(self, *args, **options):
+        flush_call_log()
+        now = timezone.now()
+        if options['prune_days']:
+            deleted, _ = LLMCallLog.objects.filter(created_at__lt=now - timedelta(days=options['prune_days'])).delete()
+            self.stdout.write(f"Pruned {deleted} log rows")
+
+        logs = LLMCallLog.objects.filter(created_at__gte=now - timedelta(hours=options['hours']))
+        if options['call_site']:
+            logs = logs.filter(call_site=options['call_site'])
+
+        by_site = {}
+        for site, duration, prompt_tokens, completion_tokens, cache, error in logs.values_list(
+            'call_site', 'duration_ms', 'prompt_tokens', 'completion_tokens', 'cache_status', 'error_class'
+        ).iterator():
+            stats = by_site.setdefault(site, {'durations': [], 'prompt': 0, 'completion': 0, 'hits': 0, 'errors': 0})
+            stats['durations'].append(duration)
+            stats['prompt'] += prompt_tokens or 0
+            stats['completion'] += completion_tokens or 0
+            stats['hits'] += cache == 'hit'
+            stats['errors'] += error is not None
+
+        self.stdout.write(f"LLM calls in the last {options['hours']:g}h")
+        self.stdout.write(
+            f"{'call site':<18}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'avg in':>8}{'avg out':>8}{'hits':>7}{'errors':>7}"
+        )
+        for site in sorted(by_site):
+            stats = by_site[site]
+            durations = sorted(stats['durations'])
+            calls = len(durations)
+            self.stdout.write(
+                f"{site:<18}{calls:>7}"
+                f"{percentile(durations, 50):>9.0f}{percentile(durations, 95):>9.0f}{percentile(durations, 99):>9.0f}"
+                f"{stats['prompt'] / calls:>8.0f}{stats['completion'] / calls:>8.0f}"
+                f"{stats['hits']:>7}{stats['errors']:>7}"
+            )
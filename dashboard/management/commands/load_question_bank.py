@@ -0,0 +1,80 @@
+import csv
+import json
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.models import BankQuestion
+from dashboard.question_bank import make_bank_question
+
+
+def read_rows(path):
+    """Yield question dicts from a .csv, .jsonl or .json file without loading CSV/JSONL into memory"""
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+    elif path.endswith('.jsonl'):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        yield from (data['questions'] if isinstance(data, dict) else data)
+    else:
+        raise CommandError("Question files must be .csv, .json or .jsonl")
+
+
+class Command(BaseCommand):
+    help = "Load interview questions from CSV/JSON/JSONL files into the question bank"
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help="Files with text/question, mode, difficulty, domain and skill/skills columns")
+        parser.add_argument('--mode', default='technical', help="Mode for rows that have none")
+        parser.add_argument('--difficulty', default='medium', help="Difficulty for rows that have none")
+        parser.add_argument('--domain', default='general', help="Domain for rows that have none")
+        parser.add_argument('--source', default='import', choices=[c for c, _ in BankQuestion.SOURCE_CHOICES])
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        valid_modes = {c for c, _ in BankQuestion._meta.get_field('mode').choices}
+        valid_difficulties = {c for c, _ in BankQuestion._meta.get_field('difficulty').choices}
+        total = skipped = 0
+
+        for path in options['paths']:
+            loaded = 0
+            rows = read_rows(path)
+            while True:
+                batch = []
+                for row in islice(rows, options['batch_size']):
+                    text = (row.get('text') or row.get('question') or '').strip()
+                    mode = (row.get('mode') or options['mode']).strip().lower()
+                    difficulty = (row.get('difficulty') or options['difficulty']).strip().lower()
+                    if not text or mode not in valid_modes or difficulty not in valid_difficulties:
+                        skipped += 1
+                        continue
+                    skills = row.get('skill_tag') or row.get('skill') or row.get('skills') or ''
+                    if isinstance(skills, list):
+                        skills = skills[0] if skills else ''
+                    batch.append(make_bank_question(
+                        text,
+                        mode=mode,
+                        difficulty=difficulty,
+                        domain=row.get('domain') or options['domain'],
+                        skill_tag=skills.split(',')[0],
+                        source=options['source'],
+                    ))
+                if not batch:
+                    break
+                # Duplicate texts (same text_hash) are skipped by the unique constraint
+                BankQuestion.objects.bulk_create(batch, ignore_conflicts=True)
+                loaded += len(batch)
+
+            self.stdout.write(f"{path}: {loaded} rows")
+            total += loaded
+
+        self.stdout.write(
+            f"Loaded {total} rows ({skipped} invalid rows skipped); "
+            f"the bank now holds {BankQuestion.objects.count()} questions"
+        )
@@ -0,0 +1,21 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from dashboard.user_stats import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the UserStats analytics rollup from InterviewSession rows (one aggregate query per user)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', default=[], help="Username to repair; repeatable (default: all users)")
+
+    def handle(self, *args, **options):
+        users = User.objects.all()
+        if options['user']:
+            users = users.filter(username__in=options['user'])
+        rebuilt = 0
+        for user_id in users.order_by('id').values_list('id', flat=True).iterator():
+            rebuild_user_stats(user_id)
+            rebuilt += 1
+        self.stdout.write(f"Rebuilt stats for {rebuilt} users")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.models import SessionQuestion
+from dashboard.scoring import score_session_questions
+
+
+class Command(BaseCommand):
+    help = "Compute local relevance/clarity/completeness scores for answered session questions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only-missing', action='store_true', help="Skip questions that already have scores")
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        answered = SessionQuestion.objects.filter(user_answer__isnull=False).exclude(user_answer='')
+        if options['only_missing']:
+            answered = answered.filter(relevance_score__isnull=True)
+
+        total, last_id = 0, 0
+        fields = ['id', 'question_text', 'user_answer', 'relevance_score', 'clarity_score', 'completeness_score']
+        while True:
+            # Keyset pagination keeps each batch an index range scan
+            batch = list(answered.filter(id__gt=last_id).order_by('id').only(*fields)[:options['batch_size']])
+            if not batch:
+                break
+            total += score_session_questions(batch)
+            last_id = batch[-1].id
+        self.stdout.write(f"Scored {total} answers")
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from dashboard.tasks import requeue_stale_tasks, run_pending_tasks
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks (answer evaluation and friends) until interrupted"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain the queue once and exit")
+        parser.add_argument('--batch-size', type=int, default=10, help="Tasks claimed per poll")
+        parser.add_argument('--sleep', type=float, default=0.5, help="Seconds to wait when the queue is empty")
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_tasks()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale tasks")
+
+        while True:
+            ran = run_pending_tasks(limit=options['batch_size'])
+            if options['once'] and not ran:
+                return
+            if not ran:
+                time.sleep(options['sleep'])
+                requeue_stale_tasks()
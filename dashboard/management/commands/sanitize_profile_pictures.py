@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from dashboard.models import UserProfile
+from dashboard.thumbnails import make_thumbnails, sanitize_picture
+
+
+class Command(BaseCommand):
+    help = "Re-store profile pictures uploaded with EXIF metadata (e.g. GPS) without it, and rebuild their variants"
+
+    def handle(self, *args, **options):
+        cleaned = failed = 0
+        profiles = UserProfile.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+        for profile in profiles.iterator():
+            try:
+                with profile.profile_picture.open('rb') as f:
+                    with Image.open(f) as image:
+                        if not image.getexif():
+                            continue
+                    f.seek(0)
+                    picture = sanitize_picture(f)
+                # The old blob loses its reference and goes with the next `manage.py gc_uploads`
+                profile.profile_picture = picture
+                profile.profile_thumbnails = {}
+                profile.save(update_fields=['profile_picture', 'profile_thumbnails'])
+                profile.profile_thumbnails = make_thumbnails(profile.profile_picture)
+                profile.save(update_fields=['profile_thumbnails'])
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Profile {profile.id}: {e}")
+                continue
+            cleaned += 1
+        self.stdout.write(f"Removed metadata from {cleaned} profile pictures ({failed} failed)")
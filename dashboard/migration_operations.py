@@ -0,0 +1,62 @@
+"""
+Migration operations that keep large tables writable while they run.
+
+On PostgreSQL, AddIndexOnline builds the index with CREATE INDEX
+CONCURRENTLY and AddUniqueConstraintOnline builds a unique index the same
+way and then attaches it as the constraint, so neither holds a lock that
+blocks inserts for the length of the build. A concurrent build that fails
+(e.g. on a duplicate) leaves an INVALID index behind under the same name,
+so both drop any index of that name first and a rerun starts clean.
+Migrations using them must set atomic = False. Other databases get the
+plain AddIndex / AddConstraint.
+"""
+from django.db import migrations
+
+
+def _is_postgresql(schema_editor):
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+def _drop_leftover_index(schema_editor, name):
+    schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}")
+
+
+class AddIndexOnline(migrations.AddIndex):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if _is_postgresql(schema_editor):
+            _drop_leftover_index(schema_editor, self.index.name)
+            schema_editor.add_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if _is_postgresql(schema_editor):
+            schema_editor.remove_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.remove_index(model, self.index)
+
+
+class AddUniqueConstraintOnline(migrations.AddConstraint):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if not _is_postgresql(schema_editor):
+            schema_editor.add_constraint(model, self.constraint)
+            return
+        quote = schema_editor.quote_name
+        table = quote(model._meta.db_table)
+        name = quote(self.constraint.name)
+        columns = ', '.join(quote(model._meta.get_field(field).column) for field in self.constraint.fields)
+        # A run that got as far as attaching the index owns it through the constraint
+        schema_editor.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        _drop_leftover_index(schema_editor, self.constraint.name)
+        schema_editor.execute(f"CREATE UNIQUE INDEX CONCURRENTLY {name} ON {table} ({columns})")
+        # Attaching a valid index is a catalog change; the table is not rescanned
+        schema_editor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}")
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_backgroundtask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewsession',
+            name='prefetch_answer_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='prefetch_token',
+            field=models.CharField(blank=True, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='prefetched_question',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='prefetched_question_number',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_interviewsession_prefetch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewsession',
+            name='answer_summary',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='summarized_through',
+            field=models.IntegerField(default=0),
+        ),
+    ]
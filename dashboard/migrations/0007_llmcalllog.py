@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0006_interviewsession_answer_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMCallLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('call_site', models.CharField(max_length=50)),
+                ('backend', models.CharField(blank=True, max_length=20)),
+                ('model_name', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('duration_ms', models.FloatField()),
+                ('prompt_tokens', models.IntegerField(blank=True, null=True)),
+                ('completion_tokens', models.IntegerField(blank=True, null=True)),
+                ('cache_status', models.CharField(choices=[('hit', 'Hit'), ('miss', 'Miss'), ('none', 'Not cached')], default='none', max_length=10)),
+                ('error_class', models.CharField(blank=True, max_length=100, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['call_site', 'created_at'], name='dashboard_l_call_si_ff005b_idx')],
+            },
+        ),
+    ]
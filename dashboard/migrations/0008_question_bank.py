@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_llmcalllog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BankQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField()),
+                ('text_hash', models.CharField(max_length=64, unique=True)),
+                ('mode', models.CharField(choices=[('hr', 'HR'), ('technical', 'Technical'), ('gd', 'Group Discussion')], default='technical', max_length=20)),
+                ('difficulty', models.CharField(choices=[('easy', 'Easy'), ('medium', 'Medium'), ('hard', 'Hard')], default='medium', max_length=10)),
+                ('domain', models.CharField(default='general', max_length=100)),
+                ('skill_tag', models.CharField(blank=True, default='', max_length=50)),
+                ('source', models.CharField(choices=[('curated', 'Curated'), ('import', 'Imported'), ('llm', 'LLM generated')], default='import', max_length=10)),
+                ('rand_key', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['mode', 'difficulty', 'skill_tag', 'rand_key'], name='dashboard_b_mode_cd2aed_idx'), models.Index(fields=['mode', 'difficulty', 'domain', 'rand_key'], name='dashboard_b_mode_2e72e6_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='sessionquestion',
+            name='bank_question',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='served', to='dashboard.bankquestion'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_question_bank'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.JSONField()),
+                ('session_question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='signature', to='dashboard.sessionquestion')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'id'], name='dashboard_q_user_id_0c1423_idx')],
+            },
+        ),
+    ]
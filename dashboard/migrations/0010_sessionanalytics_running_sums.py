@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_questionsignature'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sessionanalytics',
+            name='answer_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='sessionanalytics',
+            name='response_time_total',
+            field=models.FloatField(default=0.0),
+        ),
+    ]
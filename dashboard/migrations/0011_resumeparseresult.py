@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0010_sessionanalytics_running_sums'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeParseResult',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('ok', 'Parsed'), ('timeout', 'Timed out'), ('error', 'Failed')], max_length=10)),
+                ('text', models.TextField(blank=True, default='')),
+                ('error', models.TextField(blank=True, default='')),
+                ('ai_analysis', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
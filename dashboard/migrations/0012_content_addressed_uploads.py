@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:33
+
+import dashboard.storage
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0011_resumeparseresult'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='interviewdetails',
+            name='resume_file',
+            field=models.FileField(blank=True, null=True, storage=dashboard.storage.get_content_storage, upload_to='resumes/'),
+        ),
+        migrations.AlterField(
+            model_name='presentationpractice',
+            name='ppt_file',
+            field=models.FileField(blank=True, null=True, storage=dashboard.storage.get_content_storage, upload_to='presentations/'),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, storage=dashboard.storage.get_content_storage, upload_to='profile_pics/'),
+        ),
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.BigIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ref_count', 'updated_at'], name='dashboard_s_ref_cou_d231db_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0012_content_addressed_uploads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='presentationpractice',
+            name='slide_index',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='presentationpractice',
+            name='slide_index_status',
+            field=models.CharField(blank=True, choices=[('', 'No deck'), ('pending', 'Pending'), ('ready', 'Ready'), ('unsupported', 'Unsupported format'), ('failed', 'Failed')], default='', max_length=12),
+        ),
+    ]
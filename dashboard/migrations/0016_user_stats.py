@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:43
+
+import datetime
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('dashboard', '0015_userprofile_thumbnails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('session_count', models.IntegerField(default=0)),
+                ('scored_session_count', models.IntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0)),
+                ('best_score', models.FloatField(blank=True, null=True)),
+                ('total_duration', models.DurationField(default=datetime.timedelta)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:45
+
+from collections import Counter
+
+from django.conf import settings
+from django.db import migrations, models, transaction
+from django.db.models import Count, F
+
+from dashboard.migration_operations import AddIndexOnline, AddUniqueConstraintOnline
+
+
+def remove_duplicate_questions(apps, schema_editor):
+    # A question number served twice left two rows; keep the answered one, else the newest
+    SessionQuestion = apps.get_model('dashboard', 'SessionQuestion')
+    duplicates = (
+        SessionQuestion.objects
+        .values('session_id', 'question_number')
+        .annotate(rows=Count('id'))
+        .filter(rows__gt=1)
+    )
+    removed = Counter()
+    for group in duplicates.iterator():
+        ids = list(
+            SessionQuestion.objects
+            .filter(session_id=group['session_id'], question_number=group['question_number'])
+            .order_by(F('answered_at').desc(nulls_last=True), '-id')
+            .values_list('id', flat=True)
+        )
+        with transaction.atomic():
+            # Cascades to the rows' QuestionSignature (and anything else pointing at them)
+            _, per_model = SessionQuestion.objects.filter(id__in=ids[1:]).delete()
+        removed.update(per_model)
+    if removed:
+        details = ", ".join(f"{count} {label}" for label, count in sorted(removed.items()))
+        print(f"\n  Removed duplicate session questions: {details}")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction (see dashboard/migration_operations.py)
+    atomic = False
+
+    dependencies = [
+        ('dashboard', '0016_user_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name='interviewsession',
+            index=models.Index(fields=['user', 'started_at'], name='session_user_started_idx'),
+        ),
+        AddIndexOnline(
+            model_name='interviewsession',
+            index=models.Index(condition=models.Q(('overall_confidence_score__isnull', False)), fields=['user', 'overall_confidence_score'], name='session_user_scored_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_questions, migrations.RunPython.noop),
+        AddUniqueConstraintOnline(
+            model_name='sessionquestion',
+            constraint=models.UniqueConstraint(fields=('session', 'question_number'), name='unique_session_question_number'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def remove_generated_questions(apps, schema_editor):
+    # Follow-ups were generated from one candidate's profile and answers; served
+    # SessionQuestions keep their text, only the bank link is cleared (SET_NULL)
+    BankQuestion = apps.get_model('dashboard', 'BankQuestion')
+    deleted, _ = BankQuestion.objects.filter(source='llm').delete()
+    if deleted:
+        print(f"\n  Removed {deleted} LLM-generated questions from the shared question bank")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0017_session_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_generated_questions, migrations.RunPython.noop),
+    ]
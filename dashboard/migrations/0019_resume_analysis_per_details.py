@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0018_remove_generated_bank_questions'),
+    ]
+
+    operations = [
+        # Analyses cached per file were prompted with the first uploader's details;
+        # they are dropped rather than handed to anyone else
+        migrations.RemoveField(
+            model_name='resumeparseresult',
+            name='ai_analysis',
+        ),
+        migrations.CreateModel(
+            name='ResumeAnalysis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('details_sha256', models.CharField(max_length=64)),
+                ('analysis', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('parse_result', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='analyses', to='dashboard.resumeparseresult')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('parse_result', 'details_sha256'), name='unique_resume_analysis_input')],
+            },
+        ),
+    ]
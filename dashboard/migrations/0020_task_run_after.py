@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0019_resume_analysis_per_details'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='backgroundtask',
+            name='dashboard_b_status_8c61f8_idx',
+        ),
+        migrations.AddField(
+            model_name='backgroundtask',
+            name='run_after',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='backgroundtask',
+            index=models.Index(fields=['status', 'run_after'], name='dashboard_b_status_6c6e4e_idx'),
+        ),
+    ]
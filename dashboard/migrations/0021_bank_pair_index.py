@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:23
+
+from django.db import migrations, models
+
+from dashboard.migration_operations import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction (see dashboard/migration_operations.py)
+    atomic = False
+
+    dependencies = [
+        ('dashboard', '0020_task_run_after'),
+    ]
+
+    # The new index is built before the old ones go, so picks never fall back to a scan
+    operations = [
+        AddIndexOnline(
+            model_name='bankquestion',
+            index=models.Index(fields=['mode', 'difficulty', 'skill_tag', 'domain', 'rand_key'], name='bank_pair_rand_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='bankquestion',
+            name='dashboard_b_mode_cd2aed_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='bankquestion',
+            name='dashboard_b_mode_2e72e6_idx',
+        ),
+    ]
@@ -1,12 +1,15 @@
 
 from django.db import models
+from django.utils import timezone
+from datetime import timedelta
+from dashboard.storage import get_content_storage
 from django.contrib.auth.models import User
 
 class InterviewDetails(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
 
     # Resume (optional)
-    resume_file = models.FileField(upload_to="resumes/", blank=True, null=True)
+    resume_file = models.FileField(upload_to="resumes/", storage=get_content_storage, blank=True, null=True)
 
     # Basic Info (Form compulsory h)
     full_name = models.CharField(max_length=100)  
@@ -33,7 +36,7 @@ class InterviewDetails(models.Model):
         ('easy', 'Easy'),
         ('medium', 'Medium'),
         ('hard', 'Hard'),
-    ]`
+    ]
     difficulty = models.CharField(max_length=10, choices=DIFFICULTY_CHOICES, default='medium')
 
     MODE_CHOICES = [
@@ -65,7 +68,7 @@ class PresentationPractice(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
 
     # PPT Upload (optional)
-    ppt_file = models.FileField(upload_to="presentations/", blank=True, null=True)
+    ppt_file = models.FileField(upload_to="presentations/", storage=get_content_storage, blank=True, null=True)
 
     # Basic Info
     topic_name = models.CharField(max_length=200)
@@ -97,6 +100,18 @@ class PresentationPractice(models.Model):
         help_text="Optional: Keywords for AI (e.g. Confidence, Body Language, Communication)"
     )
 
+    # Per-slide titles and bullet text of ppt_file, filled in by the
+    # extract_slides task (see dashboard/slide_index.py)
+    SLIDE_INDEX_STATUS = [
+        ('', 'No deck'),
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('unsupported', 'Unsupported format'),
+        ('failed', 'Failed'),
+    ]
+    slide_index = models.JSONField(blank=True, null=True)  # [{'n': 1, 'title': ..., 'points': [...]}, ...]
+    slide_index_status = models.CharField(max_length=12, choices=SLIDE_INDEX_STATUS, blank=True, default='')
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -198,7 +213,8 @@ class UserProfile(models.Model):
 
     gender = models.CharField(max_length=1, choices=gender_choices, blank=True, null=True)
     dob = models.DateField(blank=True, null=True)
-    profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
+    profile_picture = models.ImageField(upload_to='profile_pics/', storage=get_content_storage, blank=True, null=True)
+    profile_thumbnails = models.JSONField(default=dict, blank=True)  # {"64": name, ...}, see dashboard/thumbnails.py
     bio = models.TextField(max_length=300, blank=True, null=True)
 
     def __str__(self):
@@ -232,6 +248,29 @@ class InterviewSession(models.Model):
     # AI-generated overall feedback
     session_feedback = models.TextField(blank=True, null=True)
     
+    # Speculatively generated next question (see dashboard/prefetch.py)
+    prefetched_question_number = models.IntegerField(null=True, blank=True)
+    prefetched_question = models.TextField(blank=True, null=True)
+    prefetch_answer_count = models.IntegerField(default=0)               # answers the prefetch was based on
+    prefetch_token = models.CharField(max_length=32, blank=True, null=True)  # newest prefetch request wins
+    
+    # Rolling summary of answers older than the prompt's verbatim window (see dashboard/answer_context.py)
+    answer_summary = models.TextField(blank=True, default='')
+    summarized_through = models.IntegerField(default=0)                  # last question_number folded in
+    
+    # Highest question_number covered by the QuestionPlan claimed at start (see dashboard/question_plan.py)
+    planned_through = models.IntegerField(default=0)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'started_at'], name='session_user_started_idx'),  # analytics, time series
+            models.Index(
+                fields=['user', 'overall_confidence_score'],
+                name='session_user_scored_idx',
+                condition=models.Q(overall_confidence_score__isnull=False),
+            ),  # best/average score of scored sessions only
+        ]
+    
     def __str__(self):
         return f"Session - {self.user.username} ({self.started_at.strftime('%Y-%m-%d %H:%M')})"
     
@@ -253,6 +292,7 @@ class SessionQuestion(models.Model):
     
     question_number = models.IntegerField()
     question_text = models.TextField()
+    bank_question = models.ForeignKey('BankQuestion', on_delete=models.SET_NULL, null=True, blank=True, related_name='served')
     user_answer = models.TextField(blank=True, null=True)
     
     # Timing information
@@ -271,6 +311,12 @@ class SessionQuestion(models.Model):
     # Improvement suggestions
     improvement_areas = models.JSONField(default=list, blank=True)  # ["communication", "technical_depth", etc.]
     
+    class Meta:
+        constraints = [
+            # Also the index behind the (session, question_number) lookups of submit_answer
+            models.UniqueConstraint(fields=['session', 'question_number'], name='unique_session_question_number'),
+        ]
+    
     def __str__(self):
         return f"Q{self.question_number} - Session {self.session.id}"
     
@@ -294,6 +340,10 @@ class SessionAnalytics(models.Model):
     word_count_total = models.IntegerField(default=0)       # Total words in all answers
     avg_words_per_answer = models.FloatField(default=0.0)
     
+    # Running sums behind the averages (maintained by dashboard/session_analytics.py)
+    answer_count = models.IntegerField(default=0)
+    response_time_total = models.FloatField(default=0.0)
+    
     # Strengths and weaknesses (AI-determined)
     key_strengths = models.JSONField(default=list, blank=True)
     improvement_areas = models.JSONField(default=list, blank=True)
@@ -307,3 +357,244 @@ class SessionAnalytics(models.Model):
     def __str__(self):
         return f"Analytics - Session {self.session.id}"
 
+
+
+# ================== LLM Response Cache ==================
+
+class LLMResponseCache(models.Model):
+    # sha256 of backend, model name, prompt template version and normalized inputs
+    key = models.CharField(max_length=64, primary_key=True)
+    call_site = models.CharField(max_length=30)
+    model_name = models.CharField(max_length=100)
+    response_text = models.TextField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True)  # LRU eviction order
+    hit_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.call_site} cache entry ({self.hit_count} hits)"
+
+
+# ================== Background Tasks ==================
+
+class BackgroundTask(models.Model):
+    # Kinds are registered in dashboard/tasks.py and run by `manage.py run_task_worker`
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, blank=True)
+
+    TASK_STATUS = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    status = models.CharField(max_length=10, choices=TASK_STATUS, default='pending')
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    run_after = models.DateTimeField(default=timezone.now)  # pushed back after each failed attempt
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after']),  # worker polls the pending tasks that are due
+        ]
+
+    def __str__(self):
+        return f"{self.kind} task #{self.id} ({self.status})"
+
+
+# ================== LLM Call Log ==================
+
+class LLMCallLog(models.Model):
+    """One LLM call (or cache hit), written in batches by dashboard.llm_metrics"""
+    CACHE_STATUS = [
+        ('hit', 'Hit'),
+        ('miss', 'Miss'),
+        ('none', 'Not cached'),
+    ]
+    
+    call_site = models.CharField(max_length=50)
+    backend = models.CharField(max_length=20, blank=True)
+    model_name = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)  # set when the call ends, not when the batch is written
+    duration_ms = models.FloatField()
+    prompt_tokens = models.IntegerField(null=True, blank=True)
+    completion_tokens = models.IntegerField(null=True, blank=True)
+    cache_status = models.CharField(max_length=10, choices=CACHE_STATUS, default='none')
+    error_class = models.CharField(max_length=100, blank=True, null=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['call_site', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.call_site} {self.duration_ms:.0f}ms ({self.cache_status})"
+
+
+# ================== Question Similarity Index ==================
+
+class QuestionSignature(models.Model):
+    """MinHash signature of a served question, for near-duplicate checks (see dashboard/similarity.py)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    session_question = models.OneToOneField(SessionQuestion, on_delete=models.CASCADE, related_name='signature')
+    signature = models.JSONField()  # list of MinHash minima
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id']),  # incremental index refresh
+        ]
+    
+    def __str__(self):
+        return f"Signature - {self.session_question}"
+
+
+# ================== Question Bank ==================
+
+class BankQuestion(models.Model):
+    """A reusable interview question, served without an LLM call (see dashboard/question_bank.py)"""
+    SOURCE_CHOICES = [
+        ('curated', 'Curated'),
+        ('import', 'Imported'),
+        ('llm', 'LLM generated'),
+    ]
+    
+    text = models.TextField()
+    text_hash = models.CharField(max_length=64, unique=True)   # sha256 of the normalized text
+    mode = models.CharField(max_length=20, choices=InterviewDetails.MODE_CHOICES, default='technical')
+    difficulty = models.CharField(max_length=10, choices=InterviewDetails.DIFFICULTY_CHOICES, default='medium')
+    domain = models.CharField(max_length=100, default='general')  # normalized, e.g. "it", "finance"
+    skill_tag = models.CharField(max_length=50, blank=True, default='')  # normalized skill, '' = any skill
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default='import')
+    rand_key = models.FloatField()  # uniform in [0, 1); random picks seek on it instead of ORDER BY RANDOM()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            # pick_bank_question seeks one (skill_tag, domain) pair at a time along rand_key
+            models.Index(fields=['mode', 'difficulty', 'skill_tag', 'domain', 'rand_key'], name='bank_pair_rand_idx'),
+        ]
+    
+    def __str__(self):
+        return f"[{self.mode}/{self.difficulty}/{self.skill_tag or '*'}] {self.text[:60]}"
+
+
+# ================== Resume Parse Cache ==================
+
+class ResumeParseResult(models.Model):
+    """Parsed text (or failure) of an uploaded resume, keyed by file hash (see dashboard/resume_parsing.py)"""
+    STATUS_CHOICES = [
+        ('ok', 'Parsed'),
+        ('timeout', 'Timed out'),
+        ('error', 'Failed'),
+    ]
+    
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    text = models.TextField(blank=True, default='')
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.status})"
+
+
+class ResumeAnalysis(models.Model):
+    """AI profile generated from a parsed resume and the form details it was prompted with"""
+    parse_result = models.ForeignKey(ResumeParseResult, on_delete=models.CASCADE, related_name='analyses')
+    details_sha256 = models.CharField(max_length=64)  # of the user_details in the prompt
+    analysis = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['parse_result', 'details_sha256'], name='unique_resume_analysis_input'),
+        ]
+    
+    def __str__(self):
+        return f"Analysis of {self.parse_result_id[:12]}"
+
+
+# ================== Content-addressed Uploads ==================
+
+class StoredFile(models.Model):
+    """Reference count of one content-addressed upload (see dashboard/storage.py, dashboard/file_refs.py)"""
+    name = models.CharField(max_length=100, primary_key=True)  # blobs/<ab>/<sha256><ext>
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)  # last retain/release; gc_uploads waits on it
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['ref_count', 'updated_at']),  # gc_uploads
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+# ================== Question Plans ==================
+
+class QuestionPlan(models.Model):
+    """Questions generated up front when a requirements form is saved (see dashboard/question_plan.py)"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    interview_details = models.ForeignKey(InterviewDetails, on_delete=models.CASCADE, null=True, blank=True)
+    presentation = models.ForeignKey(PresentationPractice, on_delete=models.CASCADE, null=True, blank=True)
+    session = models.OneToOneField(InterviewSession, on_delete=models.SET_NULL, null=True, blank=True, related_name='question_plan')  # set once a session claims the plan
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Plan {self.id} - {self.user.username} ({self.status})"
+
+
+class PlannedQuestion(models.Model):
+    plan = models.ForeignKey(QuestionPlan, on_delete=models.CASCADE, related_name='questions')
+    question_number = models.IntegerField()
+    question_text = models.TextField()
+    
+    class Meta:
+        ordering = ['question_number']
+        constraints = [
+            models.UniqueConstraint(fields=['plan', 'question_number'], name='unique_plan_question_number'),
+        ]
+    
+    def __str__(self):
+        return f"Plan {self.plan_id} Q{self.question_number}"
+
+
+# ================== Per-user Stats Rollup ==================
+
+class UserStats(models.Model):
+    """Running totals over a user's InterviewSessions for the analytics page (see dashboard/user_stats.py)"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    session_count = models.IntegerField(default=0)
+    scored_session_count = models.IntegerField(default=0)              # sessions with an overall_confidence_score
+    score_sum = models.FloatField(default=0)
+    best_score = models.FloatField(null=True, blank=True)
+    total_duration = models.DurationField(default=timedelta)           # completed sessions only
+    updated_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f"Stats - {self.user.username} ({self.session_count} sessions)"
+    
+    @property
+    def average_score(self):
+        if self.scored_session_count:
+            return self.score_sum / self.scored_session_count
+        return 0
+    
+    @property
+    def total_practice_hours(self):
+        return self.total_duration.total_seconds() / 3600
@@ -0,0 +1,105 @@
+"""
+Speculative next-question prefetch for interview sessions.
+
+As soon as question N is served, a `prefetch_question` background task
+generates question N+1 from the profile and the answers known so far and
+parks it on the InterviewSession. generate_question hands it out instantly
+when it is ready. When the answer to question N adds enough new material
+that the parked question was generated without, the prefetch is redone.
+"""
+import re
+import uuid
+
+from django.conf import settings
+
+from dashboard.models import InterviewSession, SessionQuestion
+from dashboard.tasks import enqueue_task
+
+STOPWORDS = {
+    'about', 'also', 'been', 'from', 'have', 'into', 'just', 'like', 'more', 'most',
+    'much', 'only', 'other', 'over', 'some', 'such', 'than', 'that', 'them', 'then',
+    'there', 'these', 'they', 'this', 'very', 'were', 'what', 'when', 'where', 'which',
+    'while', 'will', 'with', 'would', 'your', 'really', 'because', 'things', 'thing',
+}
+
+
+def content_words(text):
+    """Lowercased words of four or more letters, minus common filler"""
+    return {w for w in re.findall(r"[a-z][a-z0-9+#.-]{3,}", (text or "").lower()) if w not in STOPWORDS}
+
+
+def answer_is_material(answer, known_texts):
+    """True when an answer brings enough new content to change the next question"""
+    words = content_words(answer)
+    min_new_words = getattr(settings, 'PREFETCH_MIN_NEW_WORDS', 8)
+    if len(words) < min_new_words:
+        return False
+
+    known = set()
+    for text in known_texts:
+        known |= content_words(text)
+    novel = words - known
+    return (
+        len(novel) >= min_new_words
+        and len(novel) / len(words) >= getattr(settings, 'PREFETCH_NOVELTY_RATIO', 0.5)
+    )
+
+
+def schedule_question_prefetch(session_id, question_number):
+    """Queue generation of question_number; supersedes any earlier prefetch for the session"""
+    if not getattr(settings, 'QUESTION_PREFETCH', True):
+        return None
+    token = uuid.uuid4().hex
+    InterviewSession.objects.filter(id=session_id).update(
+        prefetched_question_number=question_number,
+        prefetched_question=None,
+        prefetch_token=token,
+    )
+    return enqueue_task('prefetch_question', session_id=session_id, question_number=question_number, token=token)
+
+
+def store_prefetched_question(session_id, question_number, token, question, answer_count):
+    """Park a generated question unless a newer prefetch has been requested since"""
+    return InterviewSession.objects.filter(
+        id=session_id,
+        prefetch_token=token,
+        prefetched_question_number=question_number,
+    ).update(
+        prefetched_question=question,
+        prefetch_answer_count=answer_count,
+    ) == 1
+
+
+def take_prefetched_question(session, question_number):
+    """Claim the parked question for question_number from a session row just read, or None if it is not ready"""
+    if session.prefetched_question_number != question_number or not session.prefetched_question:
+        return None
+    # Conditional on the token read, so neither two concurrent requests nor a
+    # newer prefetch stored since can lead to serving it twice or stale
+    claimed = InterviewSession.objects.filter(id=session.id, prefetch_token=session.prefetch_token).update(
+        prefetched_question_number=None,
+        prefetched_question=None,
+        prefetch_token=None,
+    )
+    return session.prefetched_question if claimed == 1 else None
+
+
+def refresh_prefetch_after_answer(session, question_number, answer):
+    """Regenerate the parked next question if this answer differs materially from what it assumed"""
+    if (
+        session.prefetched_question_number != question_number + 1
+        or not session.prefetched_question
+        or session.prefetch_answer_count >= question_number
+    ):
+        return None
+
+    details = session.interview_details
+    known_texts = [details.role, details.skills, details.experience, details.about_you]
+    known_texts += list(
+        SessionQuestion.objects
+        .filter(session=session, question_number__lt=question_number, user_answer__isnull=False)
+        .values_list('user_answer', flat=True)
+    )
+    if not answer_is_material(answer, known_texts):
+        return None
+    return schedule_question_prefetch(session.id, question_number + 1)
@@ -0,0 +1,88 @@
+"""
+Local question bank.
+
+BankQuestion rows are indexed by mode, difficulty, skill tag, domain and a
+random sort key, so pick_bank_question() finds a question this user has not
+been asked before with one index seek per (skill tag, domain) pair, all in a
+single query, instead of a scan, a sort or an ORDER BY RANDOM(). Corpora are
+loaded with `manage.py load_question_bank`.
+
+LLM-generated follow-ups are not added: their prompts carry the candidate's
+profile and earlier answers, so they can quote one user's details and must
+never be served to another.
+"""
+import hashlib
+import random
+import re
+
+from django.db.models import Subquery
+
+from dashboard.models import BankQuestion, SessionQuestion
+
+MAX_SKILL_TAGS = 10
+
+
+def normalize_tag(value):
+    """Lowercase slug for domains and skill tags: "Machine Learning" -> "machine-learning" """
+    return re.sub(r'[^a-z0-9+#.]+', '-', (value or '').strip().lower()).strip('-')[:50]
+
+
+def skill_tags(skills):
+    """Normalized tags from a comma-separated skills string"""
+    tags = []
+    for skill in (skills or '').split(','):
+        tag = normalize_tag(skill)
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags[:MAX_SKILL_TAGS]
+
+
+def question_hash(text):
+    return hashlib.sha256(" ".join(text.lower().split()).encode('utf-8')).hexdigest()
+
+
+def make_bank_question(text, mode='technical', difficulty='medium', domain='', skill_tag='', source='import'):
+    """Unsaved BankQuestion with normalized fields, ready for bulk_create"""
+    text = " ".join((text or '').split())
+    return BankQuestion(
+        text=text,
+        text_hash=question_hash(text),
+        mode=mode or 'technical',
+        difficulty=difficulty or 'medium',
+        domain=normalize_tag(domain) or 'general',
+        skill_tag=normalize_tag(skill_tag),
+        source=source,
+        rand_key=random.random(),
+    )
+
+
+def pick_bank_question(user, context):
+    """A random bank question matching the interview context that this user has not been served"""
+    domain = normalize_tag(context.get('domain'))
+    pairs = [
+        (skill_tag, pair_domain)
+        for skill_tag in skill_tags(context.get('skills')) + ['']
+        for pair_domain in ([domain, 'general'] if domain and domain != 'general' else ['general'])
+    ]
+    candidates = BankQuestion.objects.filter(
+        mode=context.get('mode') or 'technical',
+        difficulty=context.get('difficulty') or 'medium',
+    ).exclude(
+        id__in=SessionQuestion.objects
+        .filter(session__user=user, bank_question__isnull=False)
+        .values('bank_question')
+    )
+
+    def seek(seekable):
+        # One LIMIT 1 seek on the (mode, difficulty, skill_tag, domain, rand_key) index
+        # per pair, all in one query, then the lowest key among the pairs' picks
+        first_ids = seekable.order_by('rand_key').values('id')
+        found = BankQuestion.objects.filter(id__in=[
+            Subquery(first_ids.filter(skill_tag=skill_tag, domain=pair_domain)[:1])
+            for skill_tag, pair_domain in pairs
+        ])
+        return min(found, key=lambda question: question.rand_key, default=None)
+
+    # Seek to a random point on rand_key; wrap around only if nothing lies past it
+    point = random.random()
+    return seek(candidates.filter(rand_key__gte=point)) or seek(candidates)
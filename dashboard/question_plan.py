@@ -0,0 +1,192 @@
+"""
+Up-front question plans.
+
+The number of questions is known as soon as a requirements form is saved, so
+schedule_question_plan() queues one JSON-output LLM request that writes the
+whole ordered set as PlannedQuestion rows. Both the interview and the
+presentation form lead to the same session page, so a new session claims
+the user's newest ready plan of either kind, and generate_question serves each planned question
+with one indexed read instead of a generation round trip. Question numbers a
+plan does not cover, or a plan that is not ready yet, go through the usual
+bank / prefetch / LLM path.
+"""
+import json
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+
+from dashboard.llm import get_llm_client
+from dashboard.models import InterviewSession, PlannedQuestion, QuestionPlan
+from dashboard.similarity import estimated_similarity, find_near_duplicate, minhash
+from dashboard.slide_index import deck_outline
+
+
+def build_interview_plan_prompt(context, count):
+    """Build the prompt for every interview question after the fixed self-introduction"""
+    return f"""
+    You are an experienced {context.get('mode', 'technical')} interviewer planning an interview for a {context.get('position', 'Software Developer')} position.
+
+    Candidate Profile:
+    - Position: {context.get('position', 'Software Developer')}
+    - Skills: {context.get('skills', 'General skills')}
+    - Experience Level: {context.get('experience', 'Not specified')}
+    - Difficulty Level: {context.get('difficulty', 'medium')}
+    - Interview Type: {context.get('mode', 'technical')}
+    - Domain: {context.get('domain') or 'Not specified'}
+    - About: {context.get('about_you') or 'Not provided'}
+
+    The candidate has already been asked to introduce themselves. Write exactly {count} follow-up questions that:
+    1. Match the {context.get('difficulty', 'medium')} difficulty level, getting gradually more demanding
+    2. Cover different skills and situations; no two questions may ask the same thing
+    3. Are appropriate for a {context.get('mode', 'technical')} interview
+    4. Are professional, clear, and answerable in a few minutes
+
+    Respond with JSON only, in exactly this shape:
+    {{"questions": ["<question 1>", "<question 2>", ...]}}
+    """
+
+
+def build_presentation_plan_prompt(presentation, count):
+    """Build the prompt for the audience questions of a presentation practice"""
+    outline = deck_outline(presentation.slide_index) if presentation.slide_index else ''
+    deck_clause = f"\n    Slides:\n    {outline}\n" if outline else ''
+    return f"""
+    You are a member of a {presentation.get_audience_type_display()} audience listening to a presentation.
+
+    Presentation:
+    - Topic: {presentation.topic_name}
+    - Description: {presentation.description or 'Not provided'}
+    - Focus keywords: {presentation.custom_keywords or 'None'}
+    {deck_clause}
+    Write exactly {count} questions this audience would ask the presenter, in the order they would come up.
+    Each question should be different, specific to the topic, and answerable in under {presentation.time_per_question} seconds.
+
+    Respond with JSON only, in exactly this shape:
+    {{"questions": ["<question 1>", "<question 2>", ...]}}
+    """
+
+
+def parse_question_plan(text):
+    """Question strings from the model's JSON reply"""
+    # Tolerate a ```json fence even though JSON output was requested
+    match = re.search(r'\{.*\}', text or '', re.DOTALL)
+    if not match:
+        raise ValueError("Question plan did not contain a JSON object")
+    questions = json.loads(match.group(0)).get('questions') or []
+    return [" ".join(q.split()) for q in questions if isinstance(q, str) and q.strip()]
+
+
+def distinct_questions(questions, user_id=None):
+    """Drop questions that nearly repeat an earlier one in the plan or, given user_id, one the user was asked"""
+    threshold = getattr(settings, 'QUESTION_DUPLICATE_THRESHOLD', 0.6)
+    kept, signatures = [], []
+    for question in questions:
+        signature = minhash(question)
+        if any(estimated_similarity(signature, other) >= threshold for other in signatures):
+            continue
+        if user_id is not None and find_near_duplicate(user_id, question):
+            continue
+        kept.append(question)
+        signatures.append(signature)
+    return kept
+
+
+def generate_question_plan(plan_id):
+    """Fill a pending plan with one LLM request; returns how many questions were stored"""
+    plan = (
+        QuestionPlan.objects
+        .select_related('interview_details', 'presentation')
+        .filter(id=plan_id, status='pending')
+        .first()
+    )
+    if plan is None:
+        return 0  # replaced by a newer plan, or already generated
+
+    if plan.interview_details_id:
+        from dashboard.views import build_question_context
+
+        # Question 1 is always the fixed self-introduction
+        first_number, count = 2, plan.interview_details.num_questions - 1
+        prompt = build_interview_plan_prompt(build_question_context(plan.interview_details), count)
+        duplicate_user = plan.user_id
+    else:
+        # Sessions open with the same fixed question, whichever form led to them
+        first_number, count = 2, plan.presentation.num_questions - 1
+        prompt = build_presentation_plan_prompt(plan.presentation, count)
+        duplicate_user = None
+
+    client = get_llm_client()
+    if not client:
+        QuestionPlan.objects.filter(id=plan.id).update(status='failed')
+        return 0
+
+    # LLM errors propagate so the task queue retries the plan
+    questions = parse_question_plan(client.generate(prompt, call_site='question_plan', json_output=True))
+    questions = distinct_questions(questions, duplicate_user)[:count]
+    with transaction.atomic():
+        PlannedQuestion.objects.bulk_create([
+            PlannedQuestion(plan=plan, question_number=first_number + i, question_text=question)
+            for i, question in enumerate(questions)
+        ])
+        QuestionPlan.objects.filter(id=plan.id).update(status='ready')
+    return len(questions)
+
+
+def schedule_question_plan(user, interview_details=None, presentation=None):
+    """Queue plan generation for a just-saved requirements form"""
+    if not getattr(settings, 'QUESTION_PLAN', True):
+        return None
+    with transaction.atomic():
+        if interview_details is not None:
+            # Edited interview details make any plan no session has claimed yet stale
+            QuestionPlan.objects.filter(interview_details=interview_details, session__isnull=True).delete()
+        else:
+            # Only the presentation set up last is practised next
+            QuestionPlan.objects.filter(user=user, presentation__isnull=False, session__isnull=True).delete()
+        plan = QuestionPlan.objects.create(user=user, interview_details=interview_details, presentation=presentation)
+
+    if getattr(settings, 'BACKGROUND_EVALUATION', True):
+        from dashboard.tasks import enqueue_task
+
+        enqueue_task('generate_question_plan', plan_id=plan.id)
+    else:
+        try:
+            generate_question_plan(plan.id)
+        except Exception as e:
+            print(f"Question plan generation failed: {e}")
+    return plan
+
+
+def claim_question_plan(session):
+    """Attach the user's newest ready, unclaimed plan to a new session; returns its planned_through"""
+    # The newest is the form the user saved last: their interview details or a presentation
+    plan_id = (
+        QuestionPlan.objects
+        .filter(user_id=session.user_id, session__isnull=True, status='ready')
+        .filter(Q(interview_details_id=session.interview_details_id) | Q(presentation__isnull=False))
+        .order_by('-created_at')
+        .values_list('id', flat=True)
+        .first()
+    )
+    # Conditional update: two sessions started at once cannot share a plan
+    if plan_id is None or not QuestionPlan.objects.filter(id=plan_id, session__isnull=True).update(session=session):
+        return 0
+    planned_through = PlannedQuestion.objects.filter(
+        plan_id=plan_id,
+        question_number__lte=session.total_questions,
+    ).aggregate(last=Max('question_number'))['last'] or 0
+    InterviewSession.objects.filter(id=session.id).update(planned_through=planned_through)
+    session.planned_through = planned_through
+    return planned_through
+
+
+def take_planned_question(session_id, user, question_number):
+    """Planned text for question_number of a session, or None; one indexed read"""
+    return (
+        PlannedQuestion.objects
+        .filter(plan__session_id=session_id, plan__user=user, question_number=question_number)
+        .values_list('question_text', flat=True)
+        .first()
+    )
@@ -0,0 +1,129 @@
+"""
+Streaming text extraction for uploaded resumes.
+
+Extractors yield one chunk per PDF page or DOCX paragraph. extract_text()
+stops pulling chunks once RESUME_MAX_PAGES pages or RESUME_MAX_CHARS
+characters are reached and joins what it kept in a single pass, so a long
+portfolio costs no more than its first few pages. extract_path() runs the
+same extraction inside the isolated parser process, so this module must stay
+importable without Django being set up.
+"""
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+class UnsupportedResumeFormat(ValueError):
+    """Raised for uploads that are neither PDF nor DOCX"""
+
+
+@contextmanager
+def open_upload(upload):
+    """Seekable binary file for an upload, without reading it into memory.
+
+    Large uploads already live in a temporary file; small ones are already a
+    BytesIO. Anything else is spooled to disk chunk by chunk.
+    """
+    if hasattr(upload, 'temporary_file_path'):
+        with open(upload.temporary_file_path(), 'rb') as f:
+            yield f
+        return
+
+    stream = getattr(upload, 'file', upload)
+    if hasattr(stream, 'seekable') and stream.seekable():
+        position = stream.tell()
+        stream.seek(0)
+        try:
+            yield stream
+        finally:
+            stream.seek(position)
+        return
+
+    with tempfile.SpooledTemporaryFile(max_size=2 * 1024 * 1024) as spool:
+        chunks = upload.chunks() if hasattr(upload, 'chunks') else iter(lambda: stream.read(64 * 1024), b'')
+        for chunk in chunks:
+            spool.write(chunk)
+        spool.seek(0)
+        yield spool
+
+
+@contextmanager
+def upload_path(upload):
+    """Filesystem path holding an upload's bytes, for a parser in another process.
+
+    Large uploads already live in a temporary file; small in-memory ones are
+    copied to one that is removed afterwards.
+    """
+    if hasattr(upload, 'temporary_file_path'):
+        yield upload.temporary_file_path()
+        return
+
+    suffix = os.path.splitext(upload.name or '')[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix) as copy:
+        with open_upload(upload) as f:
+            shutil.copyfileobj(f, copy)
+        copy.flush()
+        yield copy.name
+
+
+def iter_pdf_chunks(f, max_pages):
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(f)
+    for index, page in enumerate(reader.pages):
+        if index >= max_pages:
+            break
+        # extract_text() returns None for image-only pages
+        yield page.extract_text() or ''
+
+
+def iter_docx_chunks(f):
+    import docx
+
+    document = docx.Document(f)
+    for paragraph in document.paragraphs:
+        yield paragraph.text
+    # Many CV templates keep their content in tables
+    for table in document.tables:
+        for row in table.rows:
+            yield " | ".join(cell.text for cell in row.cells)
+
+
+def iter_resume_chunks(f, filename, max_pages):
+    name = (filename or '').lower()
+    if name.endswith('.pdf'):
+        return iter_pdf_chunks(f, max_pages)
+    if name.endswith('.docx'):
+        return iter_docx_chunks(f)
+    raise UnsupportedResumeFormat("Unsupported file format. Please upload PDF or DOCX files.")
+
+
+def join_limited(chunks, max_chars):
+    """Join chunks with newlines, stopping once max_chars characters are collected"""
+    parts, length = [], 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        remaining = max_chars - length
+        if remaining <= 0:
+            break
+        parts.append(chunk[:remaining])
+        length += min(len(chunk), remaining) + 1
+    return "\n".join(parts)
+
+
+def extract_text(upload, max_pages=None, max_chars=None):
+    """Text of an uploaded PDF or DOCX, bounded by page and character limits"""
+    max_pages = max_pages or getattr(settings, 'RESUME_MAX_PAGES', 20)
+    max_chars = max_chars or getattr(settings, 'RESUME_MAX_CHARS', 20000)
+    with open_upload(upload) as f:
+        return join_limited(iter_resume_chunks(f, upload.name, max_pages), max_chars)
+
+
+def extract_path(path, filename, max_pages, max_chars):
+    """extract_text() for a file on disk; runs in the isolated parser process (see dashboard/resume_parsing.py)"""
+    with open(path, 'rb') as f:
+        return join_limited(iter_resume_chunks(f, filename, max_pages), max_chars)
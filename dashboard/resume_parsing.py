@@ -0,0 +1,103 @@
+"""
+Isolated, cached resume parsing.
+
+A malformed PDF can keep PyPDF2 busy for minutes, so parsing never runs in
+the web worker: each upload is parsed in its own child process (see
+dashboard/isolation.py), at most RESUME_PARSE_WORKERS at once, with a
+RESUME_PARSE_MEMORY_MB address-space limit and a RESUME_PARSE_TIMEOUT_SECONDS
+deadline.
+
+Results, including timeouts and parser errors, are stored in
+ResumeParseResult under the file's SHA-256 (also its storage name, see dashboard/storage.py), so
+uploading the same file again skips the parse; a busy parser pool or a
+crashed parser process is not the file's fault and is never stored. The AI analysis is also
+prompted with the uploader's form details, so it is cached per file *and*
+details (ResumeAnalysis): the same file uploaded by someone else, or with
+edited details, gets an analysis of its own.
+"""
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+
+from dashboard.isolation import run_isolated
+from dashboard.models import ResumeAnalysis, ResumeParseResult
+from dashboard.resume_extraction import UnsupportedResumeFormat, extract_path, upload_path
+from dashboard.storage import file_sha256
+
+# run_isolated() outcomes that are not cached: no parser slot came free, or the child died
+TRANSIENT_STATUSES = ('busy', 'crashed')
+
+_slots = None
+_slots_lock = threading.Lock()
+
+
+def _parse_slots():
+    global _slots
+    with _slots_lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(getattr(settings, 'RESUME_PARSE_WORKERS', 2))
+    return _slots
+
+
+def parse_in_subprocess(upload):
+    """Return (status, text) for an upload; status is one of run_isolated()'s"""
+    # The child opens the file itself; only its path crosses the process boundary
+    with upload_path(upload) as path:
+        return run_isolated(
+            extract_path,
+            path,
+            upload.name,
+            getattr(settings, 'RESUME_MAX_PAGES', 20),
+            getattr(settings, 'RESUME_MAX_CHARS', 20000),
+            timeout=getattr(settings, 'RESUME_PARSE_TIMEOUT_SECONDS', 10),
+            memory_mb=getattr(settings, 'RESUME_PARSE_MEMORY_MB', 512),
+            slots=_parse_slots(),
+        )
+
+
+def parse_resume(upload):
+    """Cached parse result for an upload; a ResumeParseResult whose status says whether text is usable"""
+    name = (upload.name or '').lower()
+    if not name.endswith(('.pdf', '.docx')):
+        raise UnsupportedResumeFormat("Unsupported file format. Please upload PDF or DOCX files.")
+
+    sha256 = file_sha256(upload)  # same key the upload is stored under
+    cached = ResumeParseResult.objects.filter(sha256=sha256).first()
+    if cached is not None:
+        return cached
+
+    status, text = parse_in_subprocess(upload)
+    if status != 'ok':
+        print(f"Resume parse {status} for {upload.name}: {text}")
+    if status in TRANSIENT_STATUSES:
+        # Says nothing about the file; an unsaved result lets the next upload try again
+        return ResumeParseResult(sha256=sha256, status='error', error=text)
+    result, _ = ResumeParseResult.objects.get_or_create(
+        sha256=sha256,
+        defaults={'status': status, 'text': text if status == 'ok' else '', 'error': '' if status == 'ok' else text},
+    )
+    return result
+
+
+def details_sha256(user_details):
+    return hashlib.sha256(json.dumps(user_details, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def cached_resume_analysis(parsed, user_details):
+    """Analysis generated earlier for this parsed resume and exactly these details, or None"""
+    return (
+        ResumeAnalysis.objects
+        .filter(parse_result=parsed, details_sha256=details_sha256(user_details))
+        .values_list('analysis', flat=True)
+        .first()
+    )
+
+
+def store_resume_analysis(parsed, user_details, analysis):
+    ResumeAnalysis.objects.get_or_create(
+        parse_result=parsed,
+        details_sha256=details_sha256(user_details),
+        defaults={'analysis': analysis},
+    )
@@ -0,0 +1,100 @@
+"""
+Incremental SessionAnalytics maintenance.
+
+save_answer() stores an answer, with its local scores, and folds it into the
+session's progress and analytics row inside one transaction, with single
+UPDATEs of running sums (F expressions), so nothing ever rescans
+SessionQuestion rows to produce the numbers and concurrent answers to the
+same session cannot overwrite each other's counts.
+Historical sessions are filled in by `manage.py backfill_session_analytics`.
+"""
+import re
+
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Max, Min, Value, When
+from django.db.models.functions import Cast, Greatest, Least
+from django.utils import timezone
+
+from dashboard.models import InterviewSession, SessionAnalytics, SessionQuestion
+from dashboard.scoring import SCORE_FIELDS, score_questions
+
+WORD_RE = re.compile(r"\b\w+\b")
+# Spoken hesitations that survive into typed or transcribed answers
+HESITATION_RE = re.compile(r"\b(?:um+|uh+|er+m*|hmm+)\b|\.\.\.|…", re.IGNORECASE)
+
+
+def word_count(text):
+    return len(WORD_RE.findall(text or ''))
+
+
+def hesitation_count(text):
+    return len(HESITATION_RE.findall(text or ''))
+
+
+def save_answer(question, answer, time_taken):
+    """Store the answer and local scores on question, updating the session's progress and analytics atomically.
+
+    Returns True if this was the question's first answer.
+    """
+    time_taken = time_taken or 0
+    question.user_answer = answer
+    question.answered_at = timezone.now()
+    question.time_taken_seconds = time_taken
+    # Instant local scores; the end-of-session LLM evaluation refines them
+    score_questions([question])
+    values = {field: getattr(question, field) for field in ['user_answer', 'answered_at', 'time_taken_seconds', *SCORE_FIELDS]}
+
+    with transaction.atomic():
+        rows = SessionQuestion.objects.filter(id=question.id)
+        # Only the submit that fills an empty answer counts it: a concurrent one
+        # waits on the row lock, then finds the answer filled and replaces it
+        added = rows.filter(user_answer__isnull=True).update(**values)
+        if added:
+            previous_answer, previous_time = None, 0
+        else:
+            previous_answer, previous_time = rows.select_for_update().values_list('user_answer', 'time_taken_seconds').get()
+            rows.update(**values)
+        previous_time = previous_time or 0
+        replaced = not added
+
+        words = word_count(answer) - word_count(previous_answer)
+        hesitations = hesitation_count(answer) - hesitation_count(previous_answer)
+        seconds = time_taken - previous_time
+
+        count = F('answer_count') + added
+        running_totals = dict(
+            answer_count=count,
+            response_time_total=F('response_time_total') + seconds,
+            average_response_time=Cast(F('response_time_total') + seconds, FloatField()) / Greatest(count, 1),
+            word_count_total=F('word_count_total') + words,
+            avg_words_per_answer=Cast(F('word_count_total') + words, FloatField()) / Greatest(count, 1),
+            hesitation_count=F('hesitation_count') + hesitations,
+            longest_response_time=Greatest(F('longest_response_time'), Value(float(time_taken))),
+            shortest_response_time=Case(
+                When(answer_count=0, then=Value(float(time_taken))),
+                default=Least(F('shortest_response_time'), Value(float(time_taken))),
+                output_field=FloatField(),
+            ),
+        )
+
+        if added:
+            InterviewSession.objects.filter(id=question.session_id).update(questions_answered=F('questions_answered') + 1)
+
+        analytics = SessionAnalytics.objects.filter(session_id=question.session_id)
+        # The row exists from the first answer on; only then is it created
+        if not analytics.update(**running_totals):
+            SessionAnalytics.objects.get_or_create(session_id=question.session_id)
+            analytics.update(**running_totals)
+
+        if replaced:
+            # Running extremes cannot forget the overwritten time; re-answers are
+            # rare, so take them from this session's rows
+            extremes = SessionQuestion.objects.filter(
+                session_id=question.session_id,
+                user_answer__isnull=False,
+            ).aggregate(longest=Max('time_taken_seconds'), shortest=Min('time_taken_seconds'))
+            SessionAnalytics.objects.filter(session_id=question.session_id).update(
+                longest_response_time=extremes['longest'] or 0,
+                shortest_response_time=extremes['shortest'] or 0,
+            )
+    return bool(added)
@@ -0,0 +1,141 @@
+"""
+Batched end-of-session evaluation.
+
+Instead of one LLM call per answer, evaluate_session() sends every
+question/answer pair of a session in a single JSON-output request and writes
+the per-question scores and feedback and the session-level scores back with
+bulk_update. Per-answer feedback normally arrives earlier, from the
+evaluate_answer task submit_answer queues; this call only fills in feedback
+for answers that still have none (e.g. the task failed or has not run).
+"""
+import json
+import re
+
+from dashboard.llm import get_llm_client
+from dashboard.models import InterviewSession, SessionQuestion
+from dashboard.user_stats import tracking_session
+
+QUESTION_SCORE_FIELDS = ['relevance_score', 'clarity_score', 'completeness_score']
+SESSION_SCORE_FIELDS = ['overall_confidence_score', 'communication_score', 'technical_score']
+
+
+def build_session_evaluation_prompt(context, questions):
+    """Build the prompt that scores a whole session in one request"""
+    transcript = "\n\n".join(
+        f'Question #{q.question_number}: "{q.question_text}"\n'
+        f'Candidate\'s Answer: "{q.user_answer}"'
+        for q in questions
+    )
+    return f"""
+    You are an experienced {context.get('mode', 'technical')} interviewer scoring a completed mock interview.
+
+    Interview Context:
+    - Position: {context.get('position', 'Software Developer')}
+    - Skills Focus: {context.get('skills', 'General skills')}
+    - Difficulty Level: {context.get('difficulty', 'medium')}
+    - Interview Type: {context.get('mode', 'technical')}
+
+    Transcript:
+    {transcript}
+
+    Score every answer from 0 to 100 and respond with JSON only, in exactly this shape:
+    {{
+      "questions": [
+        {{
+          "question_number": <int>,
+          "relevance_score": <0-100>,
+          "clarity_score": <0-100>,
+          "completeness_score": <0-100>,
+          "improvement_areas": ["<short_snake_case_area>", ...],
+          "feedback": "<2-3 encouraging, actionable sentences on this answer>"
+        }}
+      ],
+      "overall_confidence_score": <0-100>,
+      "communication_score": <0-100>,
+      "technical_score": <0-100>,
+      "session_feedback": "<3-4 sentences summarising strengths and what to practise next>"
+    }}
+    """
+
+
+def _score(value):
+    """Clamp a model-supplied score to 0-100, or None if it is not a number"""
+    try:
+        return max(0.0, min(100.0, float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_session_evaluation(text):
+    """Parse the model's JSON reply into per-question results and session scores"""
+    # Tolerate a ```json fence even though JSON output was requested
+    match = re.search(r'\{.*\}', text or '', re.DOTALL)
+    if not match:
+        raise ValueError("Session evaluation did not contain a JSON object")
+    data = json.loads(match.group(0))
+
+    per_question = {}
+    for item in data.get('questions') or []:
+        try:
+            number = int(item.get('question_number'))
+        except (TypeError, ValueError):
+            continue
+        areas = item.get('improvement_areas') or []
+        per_question[number] = {
+            'scores': {field: _score(item.get(field)) for field in QUESTION_SCORE_FIELDS},
+            'improvement_areas': [str(a) for a in areas] if isinstance(areas, list) else [],
+            'feedback': str(item.get('feedback') or '').strip(),
+        }
+
+    session_scores = {field: _score(data.get(field)) for field in SESSION_SCORE_FIELDS}
+    return per_question, session_scores, (data.get('session_feedback') or '').strip()
+
+
+def evaluate_session(session_id):
+    """Score every answered question of a session with one LLM call; returns the session"""
+    from dashboard.views import build_evaluation_context
+
+    session = InterviewSession.objects.select_related('interview_details').get(id=session_id)
+    questions = list(
+        SessionQuestion.objects
+        .filter(session=session, user_answer__isnull=False)
+        .exclude(user_answer='')
+        .order_by('question_number')
+    )
+    if not questions:
+        return session
+
+    client = get_llm_client()
+    if not client:
+        return session
+
+    prompt = build_session_evaluation_prompt(build_evaluation_context(session.interview_details), questions)
+    text = client.generate(prompt, call_site='session_eval', json_output=True)
+    per_question, session_scores, session_feedback = parse_session_evaluation(text)
+
+    updated = []
+    for question in questions:
+        result = per_question.get(question.question_number)
+        if not result:
+            continue
+        for field, value in result['scores'].items():
+            setattr(question, field, value)
+        question.improvement_areas = result['improvement_areas']
+        # Feedback already given for the answer (inline or by its task) is kept
+        if result['feedback'] and not question.ai_feedback:
+            question.ai_feedback = result['feedback']
+        updated.append(question)
+    SessionQuestion.objects.bulk_update(updated, QUESTION_SCORE_FIELDS + ['improvement_areas', 'ai_feedback'])
+
+    # Fall back to the mean of the question scores for anything the model left out
+    question_means = [q.overall_score for q in updated if q.overall_score]
+    fallback = round(sum(question_means) / len(question_means), 1) if question_means else None
+    # The rescored session reaches the user's analytics totals in the same transaction
+    with tracking_session(session):
+        for field in SESSION_SCORE_FIELDS:
+            value = session_scores[field]
+            setattr(session, field, value if value is not None else fallback)
+        if session_feedback:
+            session.session_feedback = session_feedback
+        session.save(update_fields=SESSION_SCORE_FIELDS + ['session_feedback'])
+    return session
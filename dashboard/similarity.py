@@ -0,0 +1,181 @@
+"""
+Near-duplicate detection for interview questions.
+
+Each stored SessionQuestion gets a MinHash signature over character 4-grams
+of its normalized text, persisted in QuestionSignature. Every worker keeps a
+per-user LSH index (signatures bucketed by band, with the question texts) in
+memory. The index is loaded lazily on first use; questions this worker stores
+are added to it directly, and rows other workers stored are pulled in at most
+every QUESTION_INDEX_REFRESH_SECONDS. A lookup is therefore a handful of dict
+probes and no query, however many questions the user has seen.
+
+A signature costs about 1 ms for a typical question (32 permutations over
+~150 shingles in pure Python); the text just checked is the text stored, so
+signature_of() keeps recent ones rather than hashing it twice.
+"""
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+
+from dashboard.models import QuestionSignature
+
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS      # candidate pairs need one band of 4 equal minima (~0.6 Jaccard)
+SHINGLE_SIZE = 4
+MAX_CACHED_USERS = 256
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)  # fixed seed: persisted signatures must stay comparable
+PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def normalize(text):
+    return " ".join(re.findall(r'[a-z0-9]+', (text or '').lower()))
+
+
+def shingle_hashes(text):
+    text = normalize(text)
+    if len(text) <= SHINGLE_SIZE:
+        grams = {text}
+    else:
+        grams = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    return [int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=8).digest(), 'big') for g in grams]
+
+
+def minhash(text):
+    """MinHash signature of text: NUM_PERM ints"""
+    hashes = shingle_hashes(text)
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in PERMUTATIONS]
+
+
+@lru_cache(maxsize=256)
+def signature_of(text):
+    """minhash(text) as a tuple, remembered for recently checked texts"""
+    return tuple(minhash(text))
+
+
+def band_keys(signature):
+    return [hash((band, tuple(signature[band * ROWS:(band + 1) * ROWS]))) for band in range(BANDS)]
+
+
+def estimated_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of the two shingle sets"""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / NUM_PERM
+
+
+class UserQuestionIndex:
+    """In-memory LSH index over one user's question signatures"""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.last_id = 0
+        self.refreshed_at = None
+        self.signatures = {}
+        self.texts = {}
+        self.question_signatures = {}  # session question id -> signature id
+        self.buckets = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def add(self, signature_id, signature, text, session_question_id):
+        # A question whose text was replaced gets a new signature row; the old
+        # text must stop matching here too, in whichever worker sees the new row
+        previous = self.question_signatures.get(session_question_id)
+        if previous is not None and previous != signature_id:
+            self.remove(previous)
+        self.question_signatures[session_question_id] = signature_id
+        self.signatures[signature_id] = signature
+        self.texts[signature_id] = text
+        for key in band_keys(signature):
+            self.buckets[key].add(signature_id)
+
+    def remove(self, signature_id):
+        signature = self.signatures.pop(signature_id, None)
+        self.texts.pop(signature_id, None)
+        if signature is not None:
+            for key in band_keys(signature):
+                self.buckets[key].discard(signature_id)
+
+    def refresh(self):
+        """Pull in signatures stored since the last refresh, by this or any other worker"""
+        rows = (
+            QuestionSignature.objects
+            .filter(user_id=self.user_id, id__gt=self.last_id)
+            .order_by('id')
+            .values_list('id', 'signature', 'session_question__question_text', 'session_question_id')
+        )
+        for signature_id, signature, text, session_question_id in rows:
+            self.add(signature_id, signature, text, session_question_id)
+            self.last_id = signature_id
+        self.refreshed_at = time.monotonic()
+
+    def is_stale(self):
+        interval = getattr(settings, 'QUESTION_INDEX_REFRESH_SECONDS', 10)
+        return self.refreshed_at is None or time.monotonic() - self.refreshed_at >= interval
+
+    def find(self, signature, threshold):
+        """Id of the most similar stored question at or above threshold, or None"""
+        candidates = set()
+        for key in band_keys(signature):
+            candidates |= self.buckets.get(key, set())
+        best_id, best_score = None, threshold
+        for signature_id in candidates:
+            score = estimated_similarity(signature, self.signatures[signature_id])
+            if score >= best_score:
+                best_id, best_score = signature_id, score
+        return best_id
+
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_user_index(user_id):
+    """This worker's index for user_id, loaded on first use and refreshed when stale"""
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is None:
+            index = _indexes[user_id] = UserQuestionIndex(user_id)
+            if len(_indexes) > MAX_CACHED_USERS:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(user_id)
+    with index.lock:
+        if index.is_stale():
+            index.refresh()
+    return index
+
+
+def find_near_duplicate(user_id, text):
+    """Text of an earlier question of this user's that text nearly repeats, or None"""
+    threshold = getattr(settings, 'QUESTION_DUPLICATE_THRESHOLD', 0.6)
+    index = get_user_index(user_id)
+    with index.lock:
+        signature_id = index.find(signature_of(text), threshold)
+        return index.texts.get(signature_id)
+
+
+def index_session_question(session_question, user_id, replaced=False):
+    """Persist the signature of a newly stored question and add it to this worker's index"""
+    if replaced:
+        # Its text changed: a new row (new id) is what incremental refreshes pick up
+        QuestionSignature.objects.filter(session_question=session_question).delete()
+    row = QuestionSignature.objects.create(
+        user_id=user_id,
+        session_question=session_question,
+        signature=list(signature_of(session_question.question_text)),
+    )
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+    if index is not None:
+        with index.lock:
+            # last_id is left alone: rows other workers commit with smaller ids
+            # must still be picked up by the next refresh
+            index.add(row.id, row.signature, session_question.question_text, session_question.id)
+    return row
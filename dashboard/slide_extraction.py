@@ -0,0 +1,107 @@
+"""
+Per-slide text extraction for presentation decks.
+
+.pptx decks are read straight from the zip package: slides are visited in
+presentation order and each slide's XML is parsed on its own, so memory is
+bounded by the largest slide rather than the deck. PDF decks are read page by
+page with PyPDF2. Each slide becomes a compact entry
+{'n': number, 'title': str, 'points': [str, ...]}.
+
+Like resume_extraction, this module runs inside the isolated parser process
+(see dashboard/isolation.py) and must stay importable without Django set up.
+"""
+import posixpath
+import xml.etree.ElementTree as ET
+import zipfile
+
+P_NS = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+A_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+R_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+TITLE_PLACEHOLDERS = {'title', 'ctrTitle'}
+MAX_SLIDE_XML_BYTES = 2 * 1024 * 1024  # a slide's text never needs more; larger parts are skipped
+MAX_POINTS = 8
+MAX_TITLE_CHARS = 120
+MAX_POINT_CHARS = 160
+
+SUPPORTED_DECK_EXTENSIONS = ('.pptx', '.pdf')
+
+
+def clip_chars(text, limit):
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit].rsplit(' ', 1)[0] + '...'
+
+
+def slide_entry(number, title, points):
+    points = [clip_chars(p, MAX_POINT_CHARS) for p in points if p.strip()][:MAX_POINTS]
+    return {'n': number, 'title': clip_chars(title, MAX_TITLE_CHARS), 'points': points}
+
+
+def _pptx_slide_paths(package):
+    presentation = ET.fromstring(package.read('ppt/presentation.xml'))
+    relationships = ET.fromstring(package.read('ppt/_rels/presentation.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in relationships.iter(f'{REL_NS}Relationship')}
+    for slide_id in presentation.iter(f'{P_NS}sldId'):
+        target = targets.get(slide_id.get(f'{R_NS}id'))
+        if not target:
+            continue
+        if target.startswith('/'):
+            yield target.lstrip('/')
+        else:
+            yield posixpath.normpath(posixpath.join('ppt', target))
+
+
+def _pptx_slide_text(root):
+    title, points = '', []
+    for shape in root.iter(f'{P_NS}sp'):
+        paragraphs = [
+            "".join(run.text or '' for run in paragraph.iter(f'{A_NS}t')).strip()
+            for paragraph in shape.iter(f'{A_NS}p')
+        ]
+        paragraphs = [p for p in paragraphs if p]
+        placeholder = shape.find(f'{P_NS}nvSpPr/{P_NS}nvPr/{P_NS}ph')
+        if not title and placeholder is not None and placeholder.get('type') in TITLE_PLACEHOLDERS:
+            title = " ".join(paragraphs)
+        else:
+            points.extend(paragraphs)
+    return title, points
+
+
+def iter_pptx_slides(f, max_slides):
+    with zipfile.ZipFile(f) as package:
+        for number, path in enumerate(_pptx_slide_paths(package), start=1):
+            if number > max_slides:
+                break
+            try:
+                info = package.getinfo(path)
+            except KeyError:
+                continue
+            if info.file_size > MAX_SLIDE_XML_BYTES:
+                yield slide_entry(number, '', [])
+                continue
+            title, points = _pptx_slide_text(ET.fromstring(package.read(info)))
+            yield slide_entry(number, title, points)
+
+
+def iter_pdf_slides(f, max_slides):
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(f)
+    for index, page in enumerate(reader.pages):
+        if index >= max_slides:
+            break
+        lines = [line.strip() for line in (page.extract_text() or '').splitlines() if line.strip()]
+        # PDF exports keep no placeholder roles; the first line is the title on nearly every deck
+        yield slide_entry(index + 1, lines[0] if lines else '', lines[1:])
+
+
+def extract_slide_index(path, filename, max_slides):
+    """Slide entries of the deck at path; runs in the isolated parser process (see dashboard/slide_index.py)"""
+    name = (filename or '').lower()
+    with open(path, 'rb') as f:
+        if name.endswith('.pptx'):
+            return list(iter_pptx_slides(f, max_slides))
+        if name.endswith('.pdf'):
+            return list(iter_pdf_slides(f, max_slides))
+    raise ValueError(f"Unsupported deck format: {filename}")
@@ -0,0 +1,73 @@
+"""
+Slide text index for PresentationPractice decks.
+
+index_presentation_slides() extracts per-slide titles and bullet points from
+ppt_file once, in an isolated parser process, and stores them on the record
+as slide_index. Question generation reads deck_outline() from that index and
+never opens the deck again. A deck already indexed for another upload of
+the same content (same content-addressed name) is copied instead of parsed.
+"""
+from django.conf import settings
+
+from dashboard.answer_context import clip
+from dashboard.isolation import run_isolated
+from dashboard.llm import estimate_tokens
+from dashboard.models import PresentationPractice
+from dashboard.slide_extraction import SUPPORTED_DECK_EXTENSIONS, extract_slide_index
+from dashboard.storage import is_blob
+
+
+def index_presentation_slides(presentation_id):
+    """Fill in slide_index for a presentation; returns the new slide_index_status"""
+    presentation = PresentationPractice.objects.only('id', 'ppt_file').get(id=presentation_id)
+    name = presentation.ppt_file.name
+    if not name:
+        status, slides = '', None
+    elif not name.lower().endswith(SUPPORTED_DECK_EXTENSIONS):
+        status, slides = 'unsupported', None
+    else:
+        slides = None
+        if is_blob(name):
+            slides = (
+                PresentationPractice.objects
+                .filter(ppt_file=name, slide_index_status='ready')
+                .exclude(id=presentation_id)
+                .values_list('slide_index', flat=True)
+                .first()
+            )
+        if slides is not None:
+            status = 'ready'
+        else:
+            status, slides = run_isolated(
+                extract_slide_index,
+                presentation.ppt_file.path,
+                name,
+                getattr(settings, 'DECK_MAX_SLIDES', 60),
+                timeout=getattr(settings, 'DECK_PARSE_TIMEOUT_SECONDS', 30),
+                memory_mb=getattr(settings, 'DECK_PARSE_MEMORY_MB', 512),
+            )
+            if status == 'ok':
+                status = 'ready'
+            else:
+                print(f"Slide extraction {status} for presentation {presentation_id}: {slides}")
+                status, slides = 'failed', None
+
+    PresentationPractice.objects.filter(id=presentation_id).update(slide_index=slides, slide_index_status=status)
+    return status
+
+
+def deck_outline(slide_index, max_tokens=None):
+    """Compact prompt text for a stored slide_index, cut at a slide boundary to fit max_tokens"""
+    max_tokens = max_tokens or getattr(settings, 'PROMPT_CONTEXT_TOKENS', 1000)
+    lines, used = [], 0
+    for slide in slide_index or []:
+        line = f"Slide {slide['n']}: {slide['title'] or '(untitled)'}"
+        if slide['points']:
+            line += " - " + "; ".join(slide['points'])
+        line = clip(line, max_tokens // 4)  # no single slide crowds out the rest
+        cost = estimate_tokens(line)
+        if used + cost > max_tokens:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(lines)
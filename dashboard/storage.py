@@ -0,0 +1,124 @@
+"""
+Content-addressed storage for user uploads.
+
+Every upload is stored once under its SHA-256, as blobs/<ab>/<sha256><ext>,
+whatever model field it came through and whatever it was called. The hash
+is taken before anything is written, so a file that is already stored costs
+one read and no write. How many rows point at each blob is tracked in
+StoredFile (see dashboard/file_refs.py); `manage.py gc_uploads` removes
+blobs nothing references any more, together with files derived from them
+(derived/<ab>/<sha256>-<suffix>, e.g. thumbnails), which are keyed by the
+same hash.
+
+This module stays free of module-level model imports because models.py
+refers to it.
+"""
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+BLOB_PREFIX = 'blobs/'
+DERIVED_PREFIX = 'derived/'
+MAX_EXTENSION_LENGTH = 10
+
+
+def file_sha256(content):
+    """Hex SHA-256 of a Django File, remembered on the object for later callers"""
+    digest = getattr(content, 'content_sha256', None)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for chunk in content.chunks():
+            hasher.update(chunk)
+        digest = content.content_sha256 = hasher.hexdigest()
+    return digest
+
+
+def blob_name(sha256, original_name):
+    # Keep the extension so served files get the right content type
+    extension = os.path.splitext(original_name or '')[1].lower()
+    if len(extension) > MAX_EXTENSION_LENGTH:
+        extension = ''
+    return f"{BLOB_PREFIX}{sha256[:2]}/{sha256}{extension}"
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(BLOB_PREFIX)
+
+
+def blob_sha256(name):
+    return posixpath.basename(name).split('.', 1)[0]
+
+
+def derived_name(name, suffix):
+    """Name of a file derived from blob name, e.g. derived_name(blob, '64.webp')"""
+    sha256 = blob_sha256(name)
+    return f"{DERIVED_PREFIX}{sha256[:2]}/{sha256}-{suffix}"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by content, so identical uploads share one file"""
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content in _save(); identical names mean identical files
+        return name
+
+    def _save(self, name, content):
+        sha256 = file_sha256(content)
+        name = blob_name(sha256, name)
+        # Registered before the existence check, so a concurrent gc_uploads has
+        # either given up on the blob or already deleted it, and it is rewritten
+        from dashboard.file_refs import register_blob
+        register_blob(name, sha256, content.size)
+        if not self.exists(name):
+            self._write(name, content)
+        return name
+
+    def save_derived(self, name, content):
+        """Store content under exactly name (from derived_name()), replacing any earlier version"""
+        self._write(name, content)
+        return name
+
+    def delete_derived(self, name):
+        """Delete every file derived from blob name"""
+        sha256 = blob_sha256(name)
+        directory = f"{DERIVED_PREFIX}{sha256[:2]}"
+        try:
+            _, files = self.listdir(directory)
+        except FileNotFoundError:
+            return
+        for filename in files:
+            if filename.startswith(f"{sha256}-"):
+                self.delete(f"{directory}/{filename}")
+
+    def _write(self, name, content):
+        path = self.path(name)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        if self.directory_permissions_mode is not None:
+            os.chmod(directory, self.directory_permissions_mode)
+
+        # Write beside the target and rename into place, so readers and
+        # concurrent writers of the same content never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in content.chunks():
+                    f.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(temp_path, self.file_permissions_mode)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+content_storage = ContentAddressedStorage()
+
+
+def get_content_storage():
+    """Storage callable for FileFields, so migrations record a reference rather than the instance"""
+    return content_storage
@@ -0,0 +1,181 @@
+"""
+Database-backed background task queue.
+
+Views enqueue work with enqueue_task(kind, **payload) and return right away;
+`python manage.py run_task_worker` claims pending rows and runs the handler
+registered for their kind. Claiming is a conditional UPDATE, so several
+workers can poll the same table without running a task twice; it also counts
+the attempt. A failed task is retried after TASK_RETRY_BACKOFF_SECONDS,
+doubling each time, until TASK_MAX_ATTEMPTS attempts were made.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from dashboard.models import BackgroundTask, InterviewSession, SessionQuestion
+
+TASK_HANDLERS = {}
+
+
+def task_handler(kind):
+    """Register a function as the handler for tasks of this kind"""
+    def register(func):
+        TASK_HANDLERS[kind] = func
+        return func
+    return register
+
+
+def enqueue_task(kind, **payload):
+    if kind not in TASK_HANDLERS:
+        raise ValueError(f"No handler registered for task kind: {kind}")
+    return BackgroundTask.objects.create(kind=kind, payload=payload)
+
+
+def claim_task(task_id):
+    """Mark a due pending task as running and count the attempt; returns False if another worker got it first"""
+    now = timezone.now()
+    # The attempt is counted before the handler runs, so a task that kills its
+    # worker still uses up attempts when requeue_stale_tasks() returns it
+    claimed = BackgroundTask.objects.filter(id=task_id, status='pending', run_after__lte=now).update(
+        status='running',
+        started_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return claimed == 1
+
+
+def retry_delay(attempts):
+    """Wait before the next attempt: TASK_RETRY_BACKOFF_SECONDS, doubling per attempt made"""
+    return timedelta(seconds=getattr(settings, 'TASK_RETRY_BACKOFF_SECONDS', 30) * 2 ** max(attempts - 1, 0))
+
+
+def run_task(task):
+    handler = TASK_HANDLERS.get(task.kind)
+    try:
+        if handler is None:
+            raise ValueError(f"No handler registered for task kind: {task.kind}")
+        handler(**task.payload)
+        task.status = 'done'
+        task.last_error = None
+    except Exception as e:
+        max_attempts = getattr(settings, 'TASK_MAX_ATTEMPTS', 3)
+        task.status = 'pending' if task.attempts < max_attempts else 'failed'
+        task.run_after = timezone.now() + retry_delay(task.attempts)
+        task.last_error = f"{e.__class__.__name__}: {e}"
+        print(f"Task {task.id} ({task.kind}) failed: {task.last_error}")
+    task.finished_at = timezone.now()
+    task.save(update_fields=['status', 'run_after', 'last_error', 'finished_at'])
+    return task.status == 'done'
+
+
+def run_pending_tasks(limit=10):
+    """Claim and run up to limit due pending tasks, longest due first; returns how many ran"""
+    task_ids = list(
+        BackgroundTask.objects
+        .filter(status='pending', run_after__lte=timezone.now())
+        .order_by('run_after')
+        .values_list('id', flat=True)[:limit]
+    )
+    ran = 0
+    for task_id in task_ids:
+        if not claim_task(task_id):
+            continue
+        run_task(BackgroundTask.objects.get(id=task_id))
+        ran += 1
+    return ran
+
+
+def requeue_stale_tasks():
+    """Return tasks left running by a worker that died to the queue, or fail those out of attempts; returns how many were requeued"""
+    now = timezone.now()
+    stale = BackgroundTask.objects.filter(
+        status='running',
+        started_at__lt=now - timedelta(seconds=getattr(settings, 'TASK_STALE_SECONDS', 300)),
+    )
+    max_attempts = getattr(settings, 'TASK_MAX_ATTEMPTS', 3)
+    # A task that keeps killing its worker must not come back forever
+    stale.filter(attempts__gte=max_attempts).update(
+        status='failed',
+        last_error="Worker stopped while running the task",
+        finished_at=now,
+    )
+    return stale.filter(attempts__lt=max_attempts).update(
+        status='pending',
+        run_after=now + retry_delay(1),
+    )
+
+
+# ---------------- Task Handlers ---------------- #
+
+@task_handler('evaluate_answer')
+def evaluate_answer_task(question_id):
+    """Generate and store AI feedback for an answered SessionQuestion"""
+    from dashboard.views import await_evaluate_answer_with_gemini, build_evaluation_context
+
+    question = SessionQuestion.objects.select_related('session__interview_details').get(id=question_id)
+    context = build_evaluation_context(question.session.interview_details)
+    question.ai_feedback = await_evaluate_answer_with_gemini(
+        question.user_answer,
+        question.question_number,
+        context,
+        question.question_text,
+    )
+    question.save(update_fields=['ai_feedback'])
+
+
+@task_handler('prefetch_question')
+def prefetch_question_task(session_id, question_number, token):
+    """Speculatively generate the next question for an interview session"""
+    from dashboard.llm import get_llm_client
+    from dashboard.prefetch import store_prefetched_question
+    from dashboard.answer_context import session_answer_context
+    from dashboard.views import build_question_context, build_question_prompt
+
+    session = InterviewSession.objects.select_related('interview_details').get(id=session_id)
+    if session.prefetch_token != token or session.status != 'active':
+        return  # superseded by a newer prefetch, or the session is over
+
+    client = get_llm_client()
+    if not client or not client.available():
+        return  # generate_question falls back on its own
+
+    answer_count = session.questions.filter(user_answer__isnull=False).count()
+    context = build_question_context(session.interview_details)
+    prompt = build_question_prompt(context, question_number, session_answer_context(session_id))
+    question = client.generate(prompt, call_site='question').strip()
+    if question:
+        store_prefetched_question(session_id, question_number, token, question, answer_count)
+
+
+@task_handler('evaluate_session')
+def evaluate_session_task(session_id):
+    """Score a completed session with a single batched LLM call"""
+    from dashboard.session_eval import evaluate_session
+
+    evaluate_session(session_id)
+
+
+@task_handler('summarize_answers')
+def summarize_answers_task(session_id):
+    """Fold answers that left the prompt window into the session's rolling summary"""
+    from dashboard.answer_context import update_answer_summary
+
+    update_answer_summary(session_id)
+
+
+@task_handler('extract_slides')
+def extract_slides_task(presentation_id):
+    """Build the per-slide text index of a presentation's uploaded deck"""
+    from dashboard.slide_index import index_presentation_slides
+
+    index_presentation_slides(presentation_id)
+
+
+@task_handler('generate_question_plan')
+def generate_question_plan_task(plan_id):
+    """Generate every question of a practice setup in one LLM request"""
+    from dashboard.question_plan import generate_question_plan
+
+    generate_question_plan(plan_id)
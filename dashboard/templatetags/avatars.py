@@ -0,0 +1,23 @@
+from django import template
+
+from dashboard.storage import content_storage
+
+register = template.Library()
+
+# Variants are chosen for high-density screens
+PIXEL_DENSITY = 2
+
+
+@register.filter
+def avatar_url(profile, css_pixels):
+    """URL of the smallest variant of the profile picture that covers css_pixels, or of the original"""
+    if not profile or not profile.profile_picture:
+        return ''
+    needed = int(css_pixels) * PIXEL_DENSITY
+    variants = sorted((int(size), name) for size, name in (profile.profile_thumbnails or {}).items())
+    for size, name in variants:
+        if size >= needed:
+            return content_storage.url(name)
+    if variants:
+        return content_storage.url(variants[-1][1])
+    return profile.profile_picture.url
@@ -1,3 +1,1289 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, models
+from django.db.migrations.state import ProjectState
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+import docx
+from PIL import Image
+
+from dashboard import answer_context, llm, llm_cache, prefetch, scoring, similarity, tasks, time_series, user_stats
+from dashboard.file_refs import retain
+from dashboard.isolation import run_isolated
+from dashboard.llm import CircuitBreaker, LLMError, StubClient
+from dashboard.migration_operations import AddIndexOnline, AddUniqueConstraintOnline
+from dashboard.question_bank import make_bank_question, pick_bank_question
+from dashboard.models import (
+    BackgroundTask, BankQuestion, InterviewDetails, InterviewSession, LLMResponseCache, PlannedQuestion,
+    PresentationPractice, QuestionPlan, ResumeAnalysis, ResumeParseResult, SessionAnalytics, SessionQuestion,
+    StoredFile, UserProfile, UserStats,
+)
+from dashboard.resume_extraction import UnsupportedResumeFormat, extract_text, join_limited
+from dashboard.resume_parsing import parse_resume
+from dashboard.session_analytics import save_answer
+from dashboard.session_eval import evaluate_session, parse_session_evaluation
+from dashboard.storage import content_storage
+from dashboard.tasks import run_pending_tasks
+from dashboard.thumbnails import sanitize_picture
+from dashboard.views import SIMPLE_INTERVIEW_QUESTIONS
+from TellmeMore import static_assets
+
+# Queries allowed per request, counting the 2 that load the login session and user
+# and the SAVEPOINT/RELEASE pair of each transaction. Raise one only together with
+# the change that needs it.
+GENERATE_FIRST_QUESTION_QUERIES = 5
+GENERATE_PLANNED_QUESTION_QUERIES = 6
+GENERATE_PREFETCHED_QUESTION_QUERIES = 9
+SUBMIT_ANSWER_QUERIES = 9
+
+
+@override_settings(BACKGROUND_EVALUATION=True, QUESTION_PREFETCH=True)
+class SessionEndpointQueryBudgetTests(TestCase):
+    """Per-endpoint query budgets for the interview session hot paths"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('candidate', password='pw12345!')
+        cls.details = InterviewDetails.objects.create(
+            user=cls.user, full_name='Candidate', email='c@example.com', education='BTech',
+            skills='Python, Django', role='Developer', mode='technical', num_questions=5,
+        )
+
+    def setUp(self):
+        # Budgets include loading the near-duplicate index, which workers keep between requests
+        similarity._indexes.clear()
+        self.client.force_login(self.user)
+        self.session_id = self.post('/dashboard/start_session/')['session_id']
+
+    def post(self, url, **data):
+        response = self.client.post(url, data=json.dumps(data), content_type='application/json')
+        body = response.json()
+        self.assertTrue(body.get('success'), body)
+        return body
+
+    def serve(self, question_number, text='Describe a project you are proud of.'):
+        return SessionQuestion.objects.create(
+            session_id=self.session_id, question_number=question_number, question_text=text,
+        )
+
+    def test_generate_first_question(self):
+        with self.assertNumQueries(GENERATE_FIRST_QUESTION_QUERIES):
+            self.post('/dashboard/generate_question/', question_number=1, session_id=self.session_id)
+        self.assertTrue(SessionQuestion.objects.filter(session_id=self.session_id, question_number=1).exists())
+
+    def test_generate_planned_question(self):
+        plan = QuestionPlan.objects.create(
+            user=self.user, interview_details=self.details, session_id=self.session_id, status='ready',
+        )
+        PlannedQuestion.objects.create(plan=plan, question_number=2, question_text='How do you test Django views?')
+        InterviewSession.objects.filter(id=self.session_id).update(planned_through=2)
+
+        with self.assertNumQueries(GENERATE_PLANNED_QUESTION_QUERIES):
+            body = self.post('/dashboard/generate_question/', question_number=2, session_id=self.session_id)
+        self.assertEqual(body['question'], 'How do you test Django views?')
+
+    def test_generate_prefetched_question(self):
+        InterviewSession.objects.filter(id=self.session_id).update(
+            prefetched_question_number=4,
+            prefetched_question='Walk me through how you would shard a growing table.',
+        )
+        with self.assertNumQueries(GENERATE_PREFETCHED_QUESTION_QUERIES):
+            body = self.post('/dashboard/generate_question/', question_number=4, session_id=self.session_id)
+        self.assertEqual(body['question'], 'Walk me through how you would shard a growing table.')
+        # Generated from this candidate's answers, so it must not reach the shared bank
+        self.assertFalse(BankQuestion.objects.exists())
+
+    def test_submit_answer(self):
+        self.serve(1)
+        with self.assertNumQueries(SUBMIT_ANSWER_QUERIES):
+            body = self.post(
+                '/dashboard/submit_answer/',
+                answer='I built an interview practice app with Django and Python.',
+                question_number=1, session_id=self.session_id, time_taken=30,
+            )
+        self.assertEqual(body['session_progress']['answered'], 1)
+        question = SessionQuestion.objects.get(session_id=self.session_id, question_number=1)
+        self.assertIsNotNone(question.relevance_score)
+        self.assertEqual(SessionAnalytics.objects.get(session_id=self.session_id).answer_count, 1)
+        # Feedback is written by a task; ai_page polls answer_feedback for it
+        self.assertTrue(body['feedback_pending'])
+        self.assertTrue(BackgroundTask.objects.filter(kind='evaluate_answer', payload={'question_id': question.id}).exists())
+
+    def test_answered_count_uses_database_increment(self):
+        self.serve(1)
+        with CaptureQueriesContext(connection) as queries:
+            self.post('/dashboard/submit_answer/', answer='First answer.', question_number=1, session_id=self.session_id)
+        # Incremented in SQL, so concurrent submits cannot overwrite each other's count
+        increments = [q['sql'] for q in queries if '"questions_answered" = ("dashboard_interviewsession"."questions_answered" + 1)' in q['sql']]
+        self.assertEqual(len(increments), 1)
+        self.assertEqual(InterviewSession.objects.get(id=self.session_id).questions_answered, 1)
+
+    def test_reanswer_is_not_counted_twice(self):
+        self.serve(1)
+        self.post('/dashboard/submit_answer/', answer='First try.', question_number=1, session_id=self.session_id)
+        self.post('/dashboard/submit_answer/', answer='Second try.', question_number=1, session_id=self.session_id)
+        self.assertEqual(InterviewSession.objects.get(id=self.session_id).questions_answered, 1)
+        self.assertEqual(SessionAnalytics.objects.get(session_id=self.session_id).answer_count, 1)
+
+    def test_concurrent_first_answers_are_counted_once(self):
+        question = self.serve(1)
+        # Two submits that both loaded the question before either saved
+        first, second = SessionQuestion.objects.get(id=question.id), SessionQuestion.objects.get(id=question.id)
+        self.assertTrue(save_answer(first, 'One two three.', 10))
+        self.assertFalse(save_answer(second, 'Four five.', 20))
+
+        self.assertEqual(InterviewSession.objects.get(id=self.session_id).questions_answered, 1)
+        analytics = SessionAnalytics.objects.get(session_id=self.session_id)
+        self.assertEqual(analytics.answer_count, 1)
+        self.assertEqual(analytics.word_count_total, 2)
+        self.assertEqual(analytics.response_time_total, 20)
+
+
+class QuestionPlanClaimTests(TestCase):
+    """New sessions pick up the plan of the requirements form saved last"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('speaker', password='pw12345!')
+        cls.details = InterviewDetails.objects.create(
+            user=cls.user, full_name='Speaker', email='s@example.com', education='BTech',
+            skills='Public speaking', role='Developer', mode='technical', num_questions=5,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def ready_plan(self, text, **owner):
+        plan = QuestionPlan.objects.create(user=self.user, status='ready', **owner)
+        PlannedQuestion.objects.create(plan=plan, question_number=2, question_text=text)
+        return plan
+
+    def start_session(self):
+        response = self.client.post('/dashboard/start_session/', content_type='application/json')
+        return response.json()['session_id']
+
+    def test_presentation_plan_is_claimed(self):
+        self.ready_plan('What should the audience remember?', interview_details=self.details)
+        presentation = PresentationPractice.objects.create(user=self.user, topic_name='Caching')
+        plan = self.ready_plan('Why does your second slide favour a CDN?', presentation=presentation)
+
+        session_id = self.start_session()
+        plan.refresh_from_db()
+        self.assertEqual(plan.session_id, session_id)
+        response = self.client.post(
+            '/dashboard/generate_question/', data=json.dumps({'question_number': 2, 'session_id': session_id}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.json()['question'], 'Why does your second slide favour a CDN?')
+
+
+def use_stub_llm(test):
+    """Run test against the in-process stub backend, with a fresh client"""
+    # The call log writes from its own thread, which would race the test database
+    stub = override_settings(LLM_BACKEND='stub', LLM_STUB_LATENCY_SECONDS=0, LLM_CALL_LOG=False)
+    stub.enable()
+    llm._client_pid = None
+    test.addCleanup(setattr, llm, '_client_pid', None)
+    test.addCleanup(stub.disable)
+
+
+class SessionEvaluationParseTests(TestCase):
+    def test_per_question_feedback_is_parsed(self):
+        per_question, scores, _ = parse_session_evaluation(json.dumps({
+            'questions': [{'question_number': 1, 'relevance_score': 140, 'feedback': ' Name the trade-offs. '}],
+            'overall_confidence_score': 70,
+        }))
+        self.assertEqual(per_question[1]['feedback'], 'Name the trade-offs.')
+        self.assertEqual(per_question[1]['scores']['relevance_score'], 100.0)
+        self.assertIsNone(scores['technical_score'])
+
+
+class CircuitBreakerProbeTests(TestCase):
+    def setUp(self):
+        self.llm = StubClient('stub', timeout=1, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0))
+        self.llm.breaker.record_failure()
+
+    def test_cancelled_probe_frees_the_probe_slot(self):
+        with self.assertRaises(asyncio.CancelledError):
+            with self.llm._guard('test'):
+                self.assertTrue(self.llm.breaker.probing)
+                raise asyncio.CancelledError()
+        self.assertFalse(self.llm.breaker.probing)
+        self.assertTrue(self.llm.breaker.allow())
+
+    def test_failed_probe_reopens_the_circuit(self):
+        with self.assertRaises(LLMError):
+            with self.llm._guard('test'):
+                raise LLMError('still down')
+        self.assertFalse(self.llm.breaker.probing)
+        self.assertIsNotNone(self.llm.breaker.opened_at)
+
+
+class ProfilePictureSanitizeTests(TestCase):
+    def test_exif_is_dropped_and_orientation_applied(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotated 90 degrees
+        exif[0x8825] = {2: (51.0, 30.0, 0.0)}  # GPS latitude
+        out = BytesIO()
+        Image.new('RGB', (40, 20), 'red').save(out, 'JPEG', exif=exif)
+
+        picture = sanitize_picture(SimpleUploadedFile('me.jpeg', out.getvalue()))
+        with Image.open(picture) as image:
+            self.assertEqual(image.format, 'JPEG')
+            self.assertEqual(image.size, (20, 40))
+            self.assertEqual(len(image.getexif()), 0)
+        self.assertEqual(picture.name, 'me.jpg')
+
+
+class UploadRefCountTests(TestCase):
+    """StoredFile reference counts and gc_uploads"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = User.objects.create_user('uploader', password='pw12345!')
+
+    def upload(self, profile, data):
+        profile.profile_picture = SimpleUploadedFile('me.png', data)
+        profile.save()
+        return StoredFile.objects.get(name=profile.profile_picture.name)
+
+    def gc(self, *args):
+        call_command('gc_uploads', *args, stdout=StringIO())
+
+    def test_refs_follow_the_field(self):
+        profile = UserProfile.objects.create(user=self.user)
+        first = self.upload(profile, b'first picture')
+        self.assertEqual((first.ref_count, first.size), (1, len(b'first picture')))
+        self.assertEqual(first.sha256, hashlib.sha256(b'first picture').hexdigest())
+
+        second = self.upload(profile, b'second picture')
+        first.refresh_from_db()
+        self.assertEqual((first.ref_count, second.ref_count), (0, 1))
+
+        profile.delete()
+        second.refresh_from_db()
+        self.assertEqual(second.ref_count, 0)
+
+    def test_gc_deletes_only_unreferenced_blobs(self):
+        profile = UserProfile.objects.create(user=self.user)
+        old = self.upload(profile, b'old picture')
+        current = self.upload(profile, b'current picture')
+
+        self.gc('--min-age-hours', '0')
+        self.assertFalse(StoredFile.objects.filter(name=old.name).exists())
+        self.assertFalse(content_storage.exists(old.name))
+        self.assertTrue(content_storage.exists(current.name))
+
+    def test_reupload_of_a_blob_due_for_gc_keeps_it(self):
+        profile = UserProfile.objects.create(user=self.user)
+        stored = self.upload(profile, b'picture')
+        profile.delete()
+        StoredFile.objects.filter(name=stored.name).update(updated_at=timezone.now() - timedelta(days=2))
+
+        other = UserProfile.objects.create(user=User.objects.create_user('second', password='pw12345!'))
+        self.upload(other, b'picture')
+        self.gc()
+        self.assertTrue(content_storage.exists(stored.name))
+        self.assertEqual(StoredFile.objects.get(name=stored.name).ref_count, 1)
+
+    def test_blob_deleted_before_the_save_is_written_again(self):
+        profile = UserProfile.objects.create(user=self.user)
+        stored = self.upload(profile, b'picture')
+        profile.delete()
+        self.gc('--min-age-hours', '0')
+        self.assertFalse(content_storage.exists(stored.name))
+
+        again = self.upload(UserProfile.objects.create(user=User.objects.create_user('second', password='pw12345!')), b'picture')
+        self.assertEqual(again.ref_count, 1)
+        self.assertTrue(content_storage.exists(again.name))
+
+    def test_retain_of_a_missing_blob_does_not_fail(self):
+        retain('blobs/ab/' + 'ab' * 32 + '.png')
+        self.assertEqual(StoredFile.objects.get(name='blobs/ab/' + 'ab' * 32 + '.png').size, 0)
+
+
+class QuestionSimilarityTests(TestCase):
+    """MinHash banding, thresholds and the per-worker index"""
+
+    def setUp(self):
+        similarity._indexes.clear()
+        self.addCleanup(similarity._indexes.clear)
+
+    def index_with(self, signature):
+        index = similarity.UserQuestionIndex(user_id=1)
+        index.add(1, signature, 'stored question', session_question_id=1)
+        return index
+
+    def test_one_shared_band_makes_a_candidate(self):
+        stored = list(range(similarity.NUM_PERM))
+        # Equal in the first 20 of 32 minima: bands 0-4 match, estimated similarity 0.625
+        probe = stored[:20] + [-1] * (similarity.NUM_PERM - 20)
+        index = self.index_with(stored)
+        self.assertEqual(index.find(probe, 0.6), 1)
+        self.assertIsNone(index.find(probe, 0.7))
+
+    def test_no_shared_band_is_never_compared(self):
+        stored = list(range(similarity.NUM_PERM))
+        # One differing minimum per band: 0.75 similar, but no band matches
+        probe = [-1 if i % similarity.ROWS == 0 else v for i, v in enumerate(stored)]
+        self.assertEqual(similarity.estimated_similarity(stored, probe), 0.75)
+        self.assertIsNone(self.index_with(stored).find(probe, 0.6))
+
+    def test_near_repeat_is_found_without_queries_once_indexed(self):
+        user = User.objects.create_user('asker', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=user, full_name='Asker', email='a@example.com', education='BTech',
+            skills='APIs', role='Developer', mode='technical', num_questions=5,
+        )
+        session = InterviewSession.objects.create(user=user, interview_details=details, total_questions=5)
+        asked = SessionQuestion.objects.create(
+            session=session, question_number=1, question_text='How would you design a rate limiter for a public API?',
+        )
+        similarity.find_near_duplicate(user.id, 'warm up')
+        similarity.index_session_question(asked, user.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                similarity.find_near_duplicate(user.id, 'How would you design a rate limiter for a public API'),
+                asked.question_text,
+            )
+            self.assertIsNone(similarity.find_near_duplicate(user.id, 'Tell me about a time you disagreed with a teammate.'))
+
+    def test_replaced_question_text_stops_matching(self):
+        user = User.objects.create_user('replacer', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=user, full_name='Replacer', email='r@example.com', education='BTech',
+            skills='APIs', role='Developer', mode='technical', num_questions=5,
+        )
+        session = InterviewSession.objects.create(user=user, interview_details=details, total_questions=5)
+        old_text = 'How would you design a rate limiter for a public API?'
+        question = SessionQuestion.objects.create(session=session, question_number=2, question_text=old_text)
+        similarity.index_session_question(question, user.id)
+        self.assertEqual(similarity.find_near_duplicate(user.id, old_text), old_text)
+
+        question.question_text = 'Tell me about a time you disagreed with a teammate.'
+        question.save()
+        similarity.index_session_question(question, user.id, replaced=True)
+        self.assertIsNone(similarity.find_near_duplicate(user.id, old_text))
+
+        # A worker that only sees the new row through its refresh drops the old text too
+        other = similarity.UserQuestionIndex(user.id)
+        other.add(999999, similarity.minhash(old_text), old_text, question.id)
+        other.refresh()
+        self.assertIsNone(other.find(similarity.minhash(old_text), 0.6))
+
+
+class TimeSeriesDownsampleTests(TestCase):
+    """LTTB reduction and day buckets of the analytics series"""
+
+    def test_endpoints_are_kept(self):
+        points = [[x, (x * 37) % 11] for x in range(1000)]
+        reduced = time_series.downsample(points, 50)
+        self.assertEqual(len(reduced), 50)
+        self.assertEqual(reduced[0], points[0])
+        self.assertEqual(reduced[-1], points[-1])
+        self.assertEqual([p[0] for p in reduced], sorted(p[0] for p in reduced))
+
+    def test_peaks_survive(self):
+        points = [[x, 0] for x in range(500)]
+        points[250][1] = 100
+        self.assertIn([250, 100], time_series.downsample(points, 20))
+
+    def test_short_series_pass_through(self):
+        points = [[x, x] for x in range(10)]
+        self.assertIs(time_series.downsample(points, 10), points)
+        self.assertIs(time_series.downsample(points, 300), points)
+        self.assertEqual(time_series.downsample([], 300), [])
+        self.assertEqual(time_series.downsample([[1, 2]], 300), [[1, 2]])
+
+    def test_tiny_thresholds_keep_everything(self):
+        self.assertEqual(list(time_series.lttb_indices([0, 1, 2, 3], [0, 1, 0, 1], 2)), [0, 1, 2, 3])
+        self.assertEqual(list(time_series.lttb_indices([0, 1, 2, 3], [0, 5, 0, 1], 3)), [0, 1, 3])
+
+    def test_sessions_are_grouped_by_day(self):
+        user = User.objects.create_user('charted', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=user, full_name='Charted', email='c@example.com', education='BTech',
+            skills='SQL', role='Developer', mode='technical', num_questions=5,
+        )
+        day = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=3)
+        # Last instant of one day, first of the next, and an unscored session on the second
+        for started, score in [(day + timedelta(hours=23, minutes=59), 80), (day + timedelta(days=1), 60), (day + timedelta(days=1, hours=2), None)]:
+            session = InterviewSession.objects.create(
+                user=user, interview_details=details, overall_confidence_score=score, questions_answered=2,
+            )
+            InterviewSession.objects.filter(id=session.id).update(
+                started_at=started, completed_at=started + timedelta(minutes=10),
+            )
+
+        data = time_series.session_series(user.id, 'day')
+        self.assertEqual(data['buckets'], 2)
+        first, second = int(day.timestamp() * 1000), int((day + timedelta(days=1)).timestamp() * 1000)
+        self.assertEqual(data['series']['score'], [[first, 80.0], [second, 60.0]])
+        self.assertEqual(data['series']['questions_answered'], [[first, 2], [second, 4]])
+        self.assertEqual(data['series']['duration_minutes'], [[first, 10.0], [second, 20.0]])
+
+
+class SessionEvaluationTests(TestCase):
+    def setUp(self):
+        use_stub_llm(self)
+        user = User.objects.create_user('evaluated', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=user, full_name='Evaluated', email='e@example.com', education='BTech',
+            skills='Python', role='Developer', mode='technical', num_questions=5,
+        )
+        self.session = InterviewSession.objects.create(user=user, interview_details=details, total_questions=5)
+
+    def test_only_missing_feedback_is_filled_in(self):
+        given = SessionQuestion.objects.create(
+            session=self.session, question_number=1, question_text='Why Django?',
+            user_answer='Batteries included.', ai_feedback='Name a battery you used.',
+        )
+        missing = SessionQuestion.objects.create(
+            session=self.session, question_number=2, question_text='Why Python?', user_answer='Readable code.',
+        )
+        evaluate_session(self.session.id)
+
+        given.refresh_from_db()
+        missing.refresh_from_db()
+        self.assertEqual(given.ai_feedback, 'Name a battery you used.')
+        self.assertTrue(missing.ai_feedback.startswith('Answer 2 is on topic'))
+        self.assertIsNotNone(missing.relevance_score)
+
+
+@override_settings(BACKGROUND_EVALUATION=True)
+class AnswerFeedbackPollTests(TestCase):
+    def setUp(self):
+        use_stub_llm(self)
+        user = User.objects.create_user('polled', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=user, full_name='Polled', email='p@example.com', education='BTech',
+            skills='Python', role='Developer', mode='technical', num_questions=5,
+        )
+        session = InterviewSession.objects.create(user=user, interview_details=details, total_questions=5)
+        SessionQuestion.objects.create(session=session, question_number=1, question_text='Why Django?')
+        self.client.force_login(user)
+        self.session_id = session.id
+
+    def test_pending_feedback_is_returned_once_the_task_ran(self):
+        body = self.client.post(
+            '/dashboard/submit_answer/', content_type='application/json',
+            data=json.dumps({'answer': 'Batteries included.', 'question_number': 1, 'session_id': self.session_id}),
+        ).json()
+        self.assertTrue(body['feedback_pending'])
+        url = f"/dashboard/answer_feedback/{body['question_id']}/"
+        self.assertEqual(self.client.get(url).json(), {'success': True, 'ready': False, 'feedback': None})
+
+        run_pending_tasks()
+        polled = self.client.get(url).json()
+        self.assertTrue(polled['ready'])
+        self.assertTrue(polled['feedback'])
+
+    def test_other_users_feedback_is_not_found(self):
+        question_id = SessionQuestion.objects.get(session_id=self.session_id).id
+        self.client.force_login(User.objects.create_user('stranger', password='pw12345!'))
+        self.assertFalse(self.client.get(f"/dashboard/answer_feedback/{question_id}/").json()['success'])
+
+
+class ResumeAnalysisTests(TestCase):
+    """The parse is shared by file; the analysis only by file and form details"""
+
+    def setUp(self):
+        use_stub_llm(self)
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        document = docx.Document()
+        document.add_paragraph('Data engineer, five years of Python and SQL.')
+        out = BytesIO()
+        document.save(out)
+        self.resume = out.getvalue()
+
+    def submit(self, username, full_name):
+        self.client.force_login(User.objects.create_user(username, password='pw12345!'))
+        self.client.post('/dashboard/interview_requirements/', {
+            'full_name': full_name, 'email': f'{username}@example.com', 'education': 'BTech', 'skills': 'Python',
+            'role': 'Developer', 'mode': 'technical', 'difficulty': 'medium', 'num_questions': 5,
+            'resume_file': SimpleUploadedFile('cv.docx', self.resume),
+        })
+        return InterviewDetails.objects.get(user__username=username).about_you
+
+    def test_same_file_from_another_user_gets_its_own_analysis(self):
+        first = self.submit('first', 'Alice Example')
+        second = self.submit('second', 'Bob Example')
+        self.assertTrue(first and second)
+        self.assertNotEqual(first, second)
+        self.assertEqual(ResumeParseResult.objects.count(), 1)
+        self.assertEqual(ResumeAnalysis.objects.count(), 2)
+
+
+class ResumeParseCacheTests(TestCase):
+    def upload(self):
+        return SimpleUploadedFile('cv.pdf', b'%PDF-1.4 resume')
+
+    def test_busy_parser_pool_is_reported_without_a_slot(self):
+        slots = threading.BoundedSemaphore(1)
+        slots.acquire()
+        self.assertEqual(run_isolated(len, 'x', timeout=0.01, slots=slots)[0], 'busy')
+
+    def test_transient_failures_are_not_cached(self):
+        for status in ('busy', 'crashed'):
+            with mock.patch('dashboard.resume_parsing.parse_in_subprocess', return_value=(status, 'try again')):
+                self.assertEqual(parse_resume(self.upload()).status, 'error')
+            self.assertFalse(ResumeParseResult.objects.exists())
+
+        with mock.patch('dashboard.resume_parsing.parse_in_subprocess', return_value=('ok', 'Python, SQL')):
+            self.assertEqual(parse_resume(self.upload()).text, 'Python, SQL')
+        self.assertEqual(ResumeParseResult.objects.get().status, 'ok')
+
+    def test_parser_errors_are_cached(self):
+        with mock.patch('dashboard.resume_parsing.parse_in_subprocess', return_value=('timeout', 'too slow')) as parse:
+            parse_resume(self.upload())
+            self.assertEqual(parse_resume(self.upload()).status, 'timeout')
+        self.assertEqual(parse.call_count, 1)
+
+
+@override_settings(TASK_MAX_ATTEMPTS=2, TASK_RETRY_BACKOFF_SECONDS=60, TASK_STALE_SECONDS=300)
+class TaskQueueTests(TestCase):
+    """Claiming, retries with backoff, and requeueing tasks of dead workers"""
+
+    def setUp(self):
+        self.calls = []
+
+        def flaky(fail):
+            self.calls.append(fail)
+            if fail:
+                raise RuntimeError('boom')
+
+        tasks.TASK_HANDLERS['test_flaky'] = flaky
+        self.addCleanup(tasks.TASK_HANDLERS.pop, 'test_flaky')
+
+    def make_due(self, task):
+        BackgroundTask.objects.filter(id=task.id).update(run_after=timezone.now() - timedelta(seconds=1))
+
+    def test_claim_counts_the_attempt_once(self):
+        task = tasks.enqueue_task('test_flaky', fail=False)
+        self.assertTrue(tasks.claim_task(task.id))
+        self.assertFalse(tasks.claim_task(task.id))
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), ('running', 1))
+
+    def test_failed_task_waits_for_its_backoff_then_gives_up(self):
+        task = tasks.enqueue_task('test_flaky', fail=True)
+        self.assertEqual(tasks.run_pending_tasks(), 1)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts, task.last_error), ('pending', 1, 'RuntimeError: boom'))
+        self.assertGreater(task.run_after, timezone.now() + timedelta(seconds=50))
+        self.assertEqual(tasks.run_pending_tasks(), 0)
+
+        self.make_due(task)
+        self.assertEqual(tasks.run_pending_tasks(), 1)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), ('failed', 2))
+        self.assertEqual(len(self.calls), 2)
+
+    def test_unknown_kinds_are_refused(self):
+        with self.assertRaises(ValueError):
+            tasks.enqueue_task('no_such_task')
+
+    def test_worker_command_drains_the_queue_once(self):
+        for _ in range(3):
+            tasks.enqueue_task('test_flaky', fail=False)
+        out = StringIO()
+        call_command('run_task_worker', '--once', '--batch-size', '2', stdout=out)
+        self.assertEqual(len(self.calls), 3)
+        self.assertFalse(BackgroundTask.objects.exclude(status='done').exists())
+
+    def test_retry_delay_doubles(self):
+        self.assertEqual([tasks.retry_delay(n).total_seconds() for n in (1, 2, 3)], [60, 120, 240])
+
+    def test_stale_tasks_are_requeued_until_out_of_attempts(self):
+        started = timezone.now() - timedelta(seconds=600)
+        crashed_once = tasks.enqueue_task('test_flaky', fail=False)
+        crashed_twice = tasks.enqueue_task('test_flaky', fail=False)
+        BackgroundTask.objects.filter(id=crashed_once.id).update(status='running', attempts=1, started_at=started)
+        BackgroundTask.objects.filter(id=crashed_twice.id).update(status='running', attempts=2, started_at=started)
+        fresh = tasks.enqueue_task('test_flaky', fail=False)
+        BackgroundTask.objects.filter(id=fresh.id).update(status='running', attempts=1, started_at=timezone.now())
+
+        self.assertEqual(tasks.requeue_stale_tasks(), 1)
+        statuses = dict(BackgroundTask.objects.values_list('id', 'status'))
+        self.assertEqual(
+            [statuses[crashed_once.id], statuses[crashed_twice.id], statuses[fresh.id]],
+            ['pending', 'failed', 'running'],
+        )
+
+
+@override_settings(LLM_CACHE_TTL_SECONDS=3600, LLM_CACHE_MAX_ENTRIES=2, LLM_CACHE_CULL_FREQUENCY=1000000)
+class LLMResponseCacheTests(TestCase):
+    """Cache keys, TTL expiry and LRU eviction of the shared LLM response cache"""
+
+    def setUp(self):
+        self.llm = StubClient('stub-model', timeout=1)
+
+    def test_key_ignores_cosmetic_whitespace_only(self):
+        key = llm_cache.make_cache_key(self.llm, 'eval', {'answer': 'I  used\nDjango '})
+        self.assertEqual(key, llm_cache.make_cache_key(self.llm, 'eval', {'answer': 'I used Django'}))
+        self.assertNotEqual(key, llm_cache.make_cache_key(self.llm, 'eval', {'answer': 'I used Flask'}))
+        self.assertNotEqual(key, llm_cache.make_cache_key(StubClient('other-model', timeout=1), 'eval', {'answer': 'I used Django'}))
+        with mock.patch.dict(llm_cache.PROMPT_VERSIONS, {'eval': 2}):
+            self.assertNotEqual(key, llm_cache.make_cache_key(self.llm, 'eval', {'answer': 'I used Django'}))
+
+    def test_expired_entries_miss(self):
+        llm_cache.store_response('fresh', self.llm, 'eval', 'fresh text')
+        llm_cache.store_response('stale', self.llm, 'eval', 'stale text')
+        LLMResponseCache.objects.filter(key='stale').update(created_at=timezone.now() - timedelta(hours=2))
+
+        self.assertEqual(llm_cache.get_cached_response('fresh'), 'fresh text')
+        self.assertIsNone(llm_cache.get_cached_response('stale'))
+        self.assertEqual(LLMResponseCache.objects.get(key='fresh').hit_count, 1)
+
+    def test_eviction_drops_expired_then_least_recently_used(self):
+        now = timezone.now()
+        for minutes, key in [(90, 'expired'), (30, 'oldest'), (20, 'older'), (10, 'newer'), (0, 'newest')]:
+            llm_cache.store_response(key, self.llm, 'eval', key)
+            LLMResponseCache.objects.filter(key=key).update(last_used_at=now - timedelta(minutes=minutes))
+        LLMResponseCache.objects.filter(key='expired').update(created_at=now - timedelta(hours=2))
+
+        self.assertEqual(llm_cache.evict_entries(), 3)
+        self.assertEqual(set(LLMResponseCache.objects.values_list('key', flat=True)), {'newer', 'newest'})
+
+    def test_cached_generate_calls_the_backend_once(self):
+        with mock.patch.object(self.llm, 'generate', wraps=self.llm.generate) as generate:
+            first = llm_cache.cached_generate(self.llm, 'prompt', 'eval', {'answer': 'x'})
+            second = llm_cache.cached_generate(self.llm, 'prompt', 'eval', {'answer': ' x '})
+        self.assertEqual(first, second)
+        self.assertEqual(generate.call_count, 1)
+
+
+def read_events(body):
+    """Split a Server-Sent Events body into (event, data) pairs"""
+    events = []
+    for message in body.decode().split('\n\n'):
+        if message:
+            event, data = message.split('\n')
+            events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+@override_settings(QUESTION_PLAN=False, QUESTION_PREFETCH=False)
+class StreamingViewTests(TestCase):
+    """Token and done events of the Server-Sent Events endpoints"""
+
+    def setUp(self):
+        use_stub_llm(self)
+        similarity._indexes.clear()
+        self.user = User.objects.create_user('streamer', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=self.user, full_name='Streamer', email='s@example.com', education='BTech',
+            skills='Python', role='Developer', mode='technical', num_questions=5,
+        )
+        self.session = InterviewSession.objects.create(user=self.user, interview_details=details, total_questions=5)
+        self.async_client = AsyncClient()
+
+    async def stream(self, url, **kwargs):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(url, **kwargs)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return read_events(b''.join([chunk async for chunk in response.streaming_content]))
+
+    async def stream_question(self, question_number):
+        return await self.stream(
+            '/dashboard/generate_question_stream/', content_type='application/json',
+            data=json.dumps({'question_number': question_number, 'session_id': self.session.id}),
+        )
+
+    async def test_first_question_is_one_token(self):
+        events = await self.stream_question(1)
+        self.assertEqual([event for event, _ in events], ['token', 'done'])
+        self.assertEqual(events[0][1]['text'], events[1][1]['question'])
+
+    async def test_generated_question_streams_tokens_then_stores_the_text(self):
+        events = await self.stream_question(4)
+        tokens = [data['text'] for event, data in events if event == 'token']
+        self.assertGreater(len(tokens), 1)
+        self.assertEqual(events[-1][0], 'done')
+        question = events[-1][1]['question']
+        self.assertEqual(''.join(tokens).strip(), question)
+        stored = await SessionQuestion.objects.aget(session=self.session, question_number=4)
+        self.assertEqual(stored.question_text, question)
+
+    async def test_feedback_stream_is_cached_after_the_first_call(self):
+        form = {'question': SIMPLE_INTERVIEW_QUESTIONS[0], 'answer': 'I build Django services.'}
+        first = await self.stream('/dashboard/simple_interview/feedback_stream/', data=form)
+        tokens = [data['text'] for event, data in first if event == 'token']
+        self.assertGreater(len(tokens), 1)
+        self.assertEqual(first[-1], ('done', {'feedback': ''.join(tokens)}))
+
+        second = await self.stream('/dashboard/simple_interview/feedback_stream/', data=form)
+        self.assertEqual(second, [('token', {'text': ''.join(tokens)}), first[-1]])
+        self.assertEqual(await LLMResponseCache.objects.acount(), 1)
+
+    async def test_feedback_stream_rejects_unknown_questions(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(
+            '/dashboard/simple_interview/feedback_stream/', data={'question': 'Anything?', 'answer': 'Yes'},
+        )
+        self.assertFalse(response.json()['success'])
+
+
+@override_settings(QUESTION_PREFETCH=True, PREFETCH_MIN_NEW_WORDS=3, PREFETCH_NOVELTY_RATIO=0.5)
+class QuestionPrefetchTests(TestCase):
+    """Parking, claiming and superseding speculatively generated questions"""
+
+    def setUp(self):
+        use_stub_llm(self)
+        user = User.objects.create_user('prefetched', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=user, full_name='Prefetched', email='p@example.com', education='BTech',
+            skills='Python, Django', role='Backend developer', mode='technical', num_questions=5,
+        )
+        self.session = InterviewSession.objects.create(user=user, interview_details=details, total_questions=5)
+
+    def reload(self):
+        return InterviewSession.objects.select_related('interview_details').get(id=self.session.id)
+
+    def test_answer_is_material_needs_enough_new_words(self):
+        known = ['Backend developer', 'Python, Django']
+        self.assertFalse(prefetch.answer_is_material('I used Python and Django.', known))
+        self.assertFalse(prefetch.answer_is_material('Python Django backend developer Kafka', known))
+        self.assertTrue(prefetch.answer_is_material('I migrated billing to Kafka streams with Postgres.', known))
+
+    def test_prefetched_question_is_served_once(self):
+        prefetch.schedule_question_prefetch(self.session.id, 2)
+        self.assertIsNone(prefetch.take_prefetched_question(self.reload(), 2))  # not generated yet
+
+        run_pending_tasks()
+        session = self.reload()
+        question = prefetch.take_prefetched_question(session, 2)
+        self.assertTrue(question)
+        self.assertIsNone(prefetch.take_prefetched_question(session, 2))
+        self.assertIsNone(self.reload().prefetched_question)
+
+    def test_newer_prefetch_supersedes_the_older_one(self):
+        prefetch.schedule_question_prefetch(self.session.id, 2)
+        stale_token = self.reload().prefetch_token
+        prefetch.schedule_question_prefetch(self.session.id, 2)
+
+        self.assertFalse(prefetch.store_prefetched_question(self.session.id, 2, stale_token, 'Stale?', 0))
+        tasks.prefetch_question_task(self.session.id, 2, stale_token)
+        self.assertIsNone(self.reload().prefetched_question)
+
+    def test_material_answer_regenerates_the_parked_question(self):
+        prefetch.schedule_question_prefetch(self.session.id, 2)
+        run_pending_tasks()
+        token = self.reload().prefetch_token
+
+        self.assertIsNone(prefetch.refresh_prefetch_after_answer(self.reload(), 1, 'Python and Django.'))
+        self.assertEqual(self.reload().prefetch_token, token)
+
+        self.assertIsNotNone(prefetch.refresh_prefetch_after_answer(
+            self.reload(), 1, 'I migrated billing to Kafka streams with Postgres.',
+        ))
+        session = self.reload()
+        self.assertNotEqual(session.prefetch_token, token)
+        self.assertIsNone(session.prefetched_question)
+
+
+@override_settings(PROMPT_RECENT_ANSWERS=2, PROMPT_CONTEXT_TOKENS=100, PROMPT_ANSWER_TOKENS=40, PROMPT_SUMMARY_TOKENS=30)
+class AnswerContextTests(TestCase):
+    """Token budgeting and the rolling summary of question prompt context"""
+
+    def setUp(self):
+        user = User.objects.create_user('contexted', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=user, full_name='Contexted', email='x@example.com', education='BTech',
+            skills='Python', role='Developer', mode='technical', num_questions=10,
+        )
+        self.session = InterviewSession.objects.create(user=user, interview_details=details, total_questions=10)
+
+    def answer(self, question_number, text):
+        SessionQuestion.objects.create(
+            session=self.session, question_number=question_number,
+            question_text=f'Question {question_number}?', user_answer=text,
+        )
+
+    def test_context_stays_within_budget_however_long_the_answers(self):
+        long_answer = 'word ' * 500
+        context = answer_context.format_answer_context('notes ' * 500, [(n, long_answer) for n in range(9, 0, -1)])
+        self.assertLessEqual(answer_context.estimate_tokens(context), 100 + 20)  # plus labels and quotes
+        self.assertIn('Summary of earlier answers:', context)
+        self.assertNotIn('Answer 1:', context)  # the oldest answers fall outside the budget
+
+    def test_recent_answers_are_oldest_first(self):
+        context = answer_context.format_answer_context('', [(3, 'third'), (2, 'second')])
+        self.assertLess(context.index('Answer 2: "second"'), context.index('Answer 3: "third"'))
+        self.assertEqual(answer_context.format_answer_context('', []), answer_context.NO_ANSWERS)
+
+    def test_client_context_summarises_older_answers(self):
+        context = answer_context.client_answer_context(['I use Python. Daily.', 'I like Django.', 'Tests matter.', ' '])
+        self.assertIn('Summary of earlier answers: I use Python.', context)
+        self.assertNotIn('Daily', context)
+        self.assertIn('Answer 2: "I like Django."', context)
+        self.assertIn('Answer 3: "Tests matter."', context)
+
+    def test_summary_folds_answers_leaving_the_recent_window(self):
+        for n, text in enumerate(['Built a CLI. Then more.', 'Led a migration.', 'Wrote tests.', 'Shipped it.'], start=1):
+            self.answer(n, text)
+        with mock.patch('dashboard.answer_context.get_llm_client', return_value=None):
+            self.assertTrue(answer_context.update_answer_summary(self.session.id))
+            self.assertFalse(answer_context.update_answer_summary(self.session.id))  # nothing new to fold
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.summarized_through, 2)
+        self.assertEqual(self.session.answer_summary, 'Built a CLI. Led a migration.')
+
+        context = answer_context.session_answer_context(self.session.id)
+        self.assertIn('Summary of earlier answers: Built a CLI. Led a migration.', context)
+        self.assertNotIn('Answer 2:', context)
+        self.assertIn('Answer 4: "Shipped it."', context)
+
+
+class AnswerScoringTests(TestCase):
+    """Local vectorized answer scores and the rescore_answers command"""
+
+    QUESTION = 'Describe a Django project where you improved database performance.'
+    GOOD = (
+        'On our Django billing project I found slow database queries with the debug toolbar. '
+        'I added composite indexes and replaced loops of single queries with select_related. '
+        'Page performance improved from two seconds to three hundred milliseconds. '
+        'I wrote regression tests so the query counts stay low.'
+    )
+
+    def setUp(self):
+        user = User.objects.create_user('scored', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=user, full_name='Scored', email='s@example.com', education='BTech',
+            skills='Python', role='Developer', mode='technical', num_questions=5,
+        )
+        self.session = InterviewSession.objects.create(user=user, interview_details=details, total_questions=5)
+
+    def test_scores_rank_answers_and_stay_in_range(self):
+        scores = scoring.score_answers(
+            [self.QUESTION] * 3,
+            [self.GOOD, 'Um, like, I basically, you know, did stuff.', ''],
+        )
+        self.assertEqual(scores.shape, (3, 3))
+        self.assertTrue(((scores >= 0) & (scores <= 100)).all())
+        self.assertTrue((scores[0] > scores[1]).all())
+        self.assertEqual(scores[2].tolist(), [0, 0, 0])
+
+    def test_batch_scores_match_one_at_a_time(self):
+        answers = [self.GOOD, 'I tuned queries.', 'Indexes. Caching. Tests.']
+        batch = scoring.score_answers([self.QUESTION] * 3, answers)
+        for row, answer in zip(batch.tolist(), answers):
+            self.assertEqual(row, scoring.score_answers([self.QUESTION], [answer])[0].tolist())
+
+    def test_rescore_command_saves_answered_questions_only(self):
+        for n, answer in enumerate([self.GOOD, 'I tuned queries.', None], start=1):
+            SessionQuestion.objects.create(
+                session=self.session, question_number=n, question_text=self.QUESTION, user_answer=answer,
+            )
+        out = StringIO()
+        call_command('rescore_answers', '--batch-size', '1', stdout=out)
+        self.assertIn('Scored 2 answers', out.getvalue())
+
+        scored = {q.question_number: q for q in SessionQuestion.objects.filter(session=self.session)}
+        expected = scoring.score_answers([self.QUESTION], [self.GOOD])[0].tolist()
+        self.assertEqual(
+            [scored[1].relevance_score, scored[1].clarity_score, scored[1].completeness_score], expected,
+        )
+        self.assertIsNotNone(scored[2].relevance_score)
+        self.assertIsNone(scored[3].relevance_score)
+
+        call_command('rescore_answers', '--only-missing', stdout=out)
+        self.assertIn('Scored 0 answers', out.getvalue())
+
+    def test_session_scores_average_the_question_scores(self):
+        questions = [
+            SessionQuestion(relevance_score=80, clarity_score=60, completeness_score=70),
+            SessionQuestion(relevance_score=60, clarity_score=80, completeness_score=50),
+            SessionQuestion(),
+        ]
+        self.assertEqual(scoring.session_scores(questions), {
+            'overall_confidence_score': 66.7, 'communication_score': 70.0, 'technical_score': 65.0,
+        })
+        self.assertIsNone(scoring.session_scores([SessionQuestion()]))
+
+
+@override_settings(BACKGROUND_EVALUATION=True, ANSWER_MAX_TIME_SECONDS=600)
+class SubmitAnswerTimeTakenTests(TestCase):
+    """submit_answer only stores a sane time_taken"""
+
+    def setUp(self):
+        user = User.objects.create_user('timed', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=user, full_name='Timed', email='t@example.com', education='BTech',
+            skills='Python', role='Developer', mode='technical', num_questions=5,
+        )
+        self.session = InterviewSession.objects.create(user=user, interview_details=details, total_questions=5)
+        self.question = SessionQuestion.objects.create(session=self.session, question_number=1, question_text='Why?')
+        self.client.force_login(user)
+
+    def submit(self, time_taken):
+        return self.client.post('/dashboard/submit_answer/', content_type='application/json', data=json.dumps({
+            'answer': 'Because.', 'question_number': 1, 'session_id': self.session.id, 'time_taken': time_taken,
+        })).json()
+
+    def test_time_taken_is_coerced_and_capped(self):
+        for sent, stored in [('42', 42), (12.7, 12), (None, 0), (86400, 600)]:
+            self.assertTrue(self.submit(sent)['success'])
+            self.question.refresh_from_db()
+            self.assertEqual(self.question.time_taken_seconds, stored)
+
+    def test_invalid_time_taken_is_rejected(self):
+        for sent in [-5, 'soon', True, [30], 'nan']:
+            body = self.submit(sent)
+            self.assertFalse(body['success'], sent)
+        self.question.refresh_from_db()
+        self.assertIsNone(self.question.user_answer)
+
+
+class SessionAnalyticsTests(TestCase):
+    """Running sums kept by save_answer and rebuilt by backfill_session_analytics"""
+
+    FIELDS = [
+        'answer_count', 'response_time_total', 'average_response_time', 'longest_response_time',
+        'shortest_response_time', 'word_count_total', 'avg_words_per_answer', 'hesitation_count',
+    ]
+
+    def setUp(self):
+        user = User.objects.create_user('analysed', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=user, full_name='Analysed', email='a@example.com', education='BTech',
+            skills='Python', role='Developer', mode='technical', num_questions=5,
+        )
+        self.session = InterviewSession.objects.create(user=user, interview_details=details, total_questions=5)
+        self.questions = [
+            SessionQuestion.objects.create(session=self.session, question_number=n, question_text=f'Question {n}?')
+            for n in range(1, 4)
+        ]
+
+    def analytics(self):
+        return SessionAnalytics.objects.filter(session=self.session).values(*self.FIELDS).get()
+
+    def test_running_sums_follow_each_answer(self):
+        self.assertTrue(save_answer(self.questions[0], 'Um I built an API', 30))
+        self.assertTrue(save_answer(self.questions[1], 'I wrote the tests too', 10))
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.questions_answered, 2)
+        self.assertEqual(self.analytics(), {
+            'answer_count': 2, 'response_time_total': 40, 'average_response_time': 20,
+            'longest_response_time': 30, 'shortest_response_time': 10,
+            'word_count_total': 10, 'avg_words_per_answer': 5, 'hesitation_count': 1,
+        })
+        self.assertIsNotNone(SessionQuestion.objects.get(id=self.questions[0].id).relevance_score)
+
+    def test_reanswer_replaces_its_contribution(self):
+        save_answer(self.questions[0], 'Um I built an API', 30)
+        save_answer(self.questions[1], 'I wrote the tests too', 10)
+        self.assertFalse(save_answer(self.questions[0], 'Rewrote it', 20))
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.questions_answered, 2)
+        self.assertEqual(self.analytics(), {
+            'answer_count': 2, 'response_time_total': 30, 'average_response_time': 15,
+            'longest_response_time': 20, 'shortest_response_time': 10,
+            'word_count_total': 7, 'avg_words_per_answer': 3.5, 'hesitation_count': 0,
+        })
+
+    def test_backfill_matches_the_running_sums(self):
+        for question, (answer, seconds) in zip(self.questions, [('Um I built an API', 30), ('Tests... uh', 5), ('Done', 12)]):
+            save_answer(question, answer, seconds)
+        expected = self.analytics()
+
+        SessionAnalytics.objects.filter(session=self.session).delete()
+        out = StringIO()
+        call_command('backfill_session_analytics', '--only-missing', '--batch-size', '1', stdout=out)
+        self.assertIn('Backfilled analytics for 1 sessions', out.getvalue())
+        self.assertEqual(self.analytics(), expected)
+
+        SessionAnalytics.objects.filter(session=self.session).update(answer_count=99)
+        call_command('backfill_session_analytics', stdout=out)
+        self.assertEqual(self.analytics(), expected)
+
+
+class ResumeExtractionTests(TestCase):
+    """Page and character limits of streaming resume text extraction"""
+
+    def docx_upload(self, paragraphs, table_rows=()):
+        document = docx.Document()
+        for text in paragraphs:
+            document.add_paragraph(text)
+        if table_rows:
+            table = document.add_table(rows=len(table_rows), cols=len(table_rows[0]))
+            for row, cells in zip(table.rows, table_rows):
+                for cell, text in zip(row.cells, cells):
+                    cell.text = text
+        out = BytesIO()
+        document.save(out)
+        return SimpleUploadedFile('cv.docx', out.getvalue())
+
+    def test_docx_paragraphs_and_tables_are_extracted(self):
+        upload = self.docx_upload(['Data engineer', '', 'Python and SQL'], [('Skills', 'Spark')])
+        self.assertEqual(extract_text(upload), 'Data engineer\nPython and SQL\nSkills | Spark')
+
+    def test_character_limit_stops_reading_chunks(self):
+        pulled = []
+
+        def chunks():
+            for n in range(100):
+                pulled.append(n)
+                yield 'x' * 10
+
+        self.assertEqual(join_limited(chunks(), 25), 'x' * 10 + '\n' + 'x' * 10 + '\n' + 'xxx')
+        self.assertEqual(len(pulled), 4)  # the chunk that finds the budget spent is the last one read
+
+    def test_pdf_pages_past_the_limit_are_never_parsed(self):
+        pages = [mock.Mock(**{'extract_text.return_value': f'Page {n}'}) for n in range(10)]
+        pages[1].extract_text.return_value = None  # image-only page
+        with mock.patch('PyPDF2.PdfReader', return_value=mock.Mock(pages=pages)):
+            text = extract_text(SimpleUploadedFile('cv.pdf', b'%PDF-1.4'), max_pages=3)
+        self.assertEqual(text, 'Page 0\nPage 2')
+        self.assertEqual([page.extract_text.called for page in pages[:4]], [True, True, True, False])
+
+    def test_other_formats_are_rejected(self):
+        with self.assertRaises(UnsupportedResumeFormat):
+            extract_text(SimpleUploadedFile('cv.txt', b'plain text'))
+
+
+class StaticAssetTests(TestCase):
+    """Hashed names, .webp/.gz variants and their serving by static_files_middleware"""
+
+    def setUp(self):
+        source, root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source)
+        self.addCleanup(shutil.rmtree, root)
+        with open(f'{source}/site.css', 'w') as f:
+            f.write('body { margin: 0; padding: 0; color: #333; }\n' * 50)
+        with open(f'{source}/tiny.css', 'w') as f:
+            f.write('p{}')
+        Image.linear_gradient('L').convert('RGB').save(f'{source}/logo.png')
+
+        static = override_settings(
+            STATIC_ROOT=root, STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        static.enable()
+        self.addCleanup(static.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        self.root = root
+        self.addCleanup(self.reset_index)
+        self.reset_index()
+
+    def reset_index(self):
+        static_assets._index = None
+        static_assets._file_cache.clear()
+
+    def hashed(self, name):
+        with open(f'{self.root}/staticfiles.json') as f:
+            return json.load(f)['paths'][name]
+
+    def test_collectstatic_writes_smaller_variants_only(self):
+        site = self.hashed('site.css')
+        self.assertNotEqual(site, 'site.css')
+        self.assertTrue(os.path.exists(f'{self.root}/site.css'))
+        self.assertTrue(os.path.exists(f'{self.root}/{site}.gz'))
+        self.assertTrue(os.path.exists(f'{self.root}/{self.hashed("logo.png")}.webp'))
+        self.assertFalse(os.path.exists(f'{self.root}/{self.hashed("tiny.css")}.gz'))
+
+    def test_gzip_is_served_to_clients_that_accept_it(self):
+        url = '/static/' + self.hashed('site.css')
+        plain = self.client.get(url)
+        self.assertEqual(plain['Cache-Control'], static_assets.IMMUTABLE_CACHE)
+        self.assertEqual(plain['Vary'], 'Accept-Encoding')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertTrue(plain.content.startswith(b'body'))
+
+        zipped = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(zipped['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(zipped.content), plain.content)
+        self.assertNotEqual(zipped['ETag'], plain['ETag'])
+
+    def test_webp_is_served_to_clients_that_accept_it(self):
+        url = '/static/' + self.hashed('logo.png')
+        self.assertEqual(self.client.get(url)['Content-Type'], 'image/png')
+        webp = self.client.get(url, HTTP_ACCEPT='image/avif,image/webp,*/*')
+        self.assertEqual(webp['Content-Type'], 'image/webp')
+        self.assertEqual(webp['Vary'], 'Accept')
+
+    def test_revalidation_and_unhashed_names(self):
+        url = '/static/' + self.hashed('site.css')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get('/static/site.css')['Cache-Control'], static_assets.REVALIDATE_CACHE)
+        self.assertEqual(self.client.get('/static/missing.css').status_code, 404)
+
+
+class UserStatsRollupTests(TestCase):
+    """UserStats follows session changes without double counting"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('rolled', password='pw12345!')
+        self.details = InterviewDetails.objects.create(
+            user=self.user, full_name='Rolled', email='r@example.com', education='BTech',
+            skills='Python', role='Developer', mode='technical', num_questions=5,
+        )
+
+    def start(self):
+        session = InterviewSession.objects.create(user=self.user, interview_details=self.details, total_questions=5)
+        user_stats.record_session_started(self.user.id)
+        return session
+
+    def finish(self, session, score, minutes=10):
+        with user_stats.tracking_session(session):
+            session.completed_at = session.started_at + timedelta(minutes=minutes)
+            session.overall_confidence_score = score
+            session.save()
+
+    def stats(self):
+        return UserStats.objects.values(
+            'session_count', 'scored_session_count', 'score_sum', 'best_score', 'total_duration',
+        ).get(user=self.user)
+
+    def test_rescoring_a_session_counts_it_once(self):
+        first, second = self.start(), self.start()
+        self.finish(first, 80)
+        self.finish(first, 90)
+        self.assertEqual(self.stats(), {
+            'session_count': 2, 'scored_session_count': 1, 'score_sum': 90, 'best_score': 90,
+            'total_duration': timedelta(minutes=10),
+        })
+        self.finish(second, 70, minutes=5)
+        self.assertEqual(self.stats(), user_stats.aggregate_user_stats(self.user.id))
+
+    def test_lowering_the_best_score_looks_the_maximum_up_again(self):
+        first, second = self.start(), self.start()
+        self.finish(first, 90)
+        self.finish(second, 70)
+        self.finish(first, 50)
+        self.assertEqual(self.stats()['best_score'], 70)
+        self.finish(second, None)
+        self.assertEqual(self.stats()['best_score'], 50)
+        self.assertEqual(self.stats(), user_stats.aggregate_user_stats(self.user.id))
+
+    def test_missing_or_stale_rows_are_rebuilt(self):
+        self.finish(self.start(), 60)
+        UserStats.objects.all().delete()
+        self.assertEqual(user_stats.get_user_stats(self.user.id).score_sum, 60)
+
+        UserStats.objects.update(session_count=40)
+        out = StringIO()
+        call_command('rebuild_user_stats', '--user', 'rolled', stdout=out)
+        self.assertIn('Rebuilt stats for 1 users', out.getvalue())
+        self.assertEqual(self.stats()['session_count'], 1)
+
+
+class OnlineMigrationOperationTests(TransactionTestCase):
+    """SQL of the online index operations on PostgreSQL, and their plain fallback elsewhere"""
+
+    INDEX = models.Index(fields=['user', 'started_at'], name='session_user_started_idx')
+    CONSTRAINT = models.UniqueConstraint(fields=('session', 'question_number'), name='unique_session_question_number')
+
+    def postgresql_editor(self):
+        editor = mock.Mock()
+        editor.connection.vendor = 'postgresql'
+        editor.connection.alias = 'default'
+        editor.quote_name = lambda name: f'"{name}"'
+        return editor
+
+    def test_index_is_rebuilt_concurrently_on_postgresql(self):
+        state = ProjectState.from_apps(apps)
+        editor = self.postgresql_editor()
+        AddIndexOnline('interviewsession', self.INDEX).database_forwards('dashboard', editor, state, state)
+        editor.execute.assert_called_once_with('DROP INDEX CONCURRENTLY IF EXISTS "session_user_started_idx"')
+        editor.add_index.assert_called_once_with(mock.ANY, self.INDEX, concurrently=True)
+
+        AddIndexOnline('interviewsession', self.INDEX).database_backwards('dashboard', editor, state, state)
+        editor.remove_index.assert_called_once_with(mock.ANY, self.INDEX, concurrently=True)
+
+    def test_unique_constraint_attaches_a_concurrent_index_on_postgresql(self):
+        state = ProjectState.from_apps(apps)
+        editor = self.postgresql_editor()
+        AddUniqueConstraintOnline('sessionquestion', self.CONSTRAINT).database_forwards('dashboard', editor, state, state)
+        name, table = '"unique_session_question_number"', '"dashboard_sessionquestion"'
+        self.assertEqual([c.args[0] for c in editor.execute.call_args_list], [
+            f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}',
+            f'DROP INDEX CONCURRENTLY IF EXISTS {name}',
+            f'CREATE UNIQUE INDEX CONCURRENTLY {name} ON {table} ("session_id", "question_number")',
+            f'ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}',
+        ])
+
+    def test_other_databases_get_a_plain_index(self):
+        operation = AddIndexOnline('interviewsession', models.Index(fields=['status'], name='test_online_status_idx'))
+        before = ProjectState.from_apps(apps)
+        after = before.clone()
+        operation.state_forwards('dashboard', after)
+
+        with connection.schema_editor() as editor:
+            operation.database_forwards('dashboard', editor, before, after)
+        with connection.cursor() as cursor:
+            self.assertIn('test_online_status_idx', connection.introspection.get_constraints(cursor, 'dashboard_interviewsession'))
+
+        with connection.schema_editor() as editor:
+            operation.database_backwards('dashboard', editor, after, before)
+        with connection.cursor() as cursor:
+            self.assertNotIn('test_online_status_idx', connection.introspection.get_constraints(cursor, 'dashboard_interviewsession'))
+
+
+class QuestionBankPickTests(TestCase):
+    """pick_bank_question seeks each (skill tag, domain) pair and never repeats a question"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('banked', password='pw12345!')
+        details = InterviewDetails.objects.create(
+            user=self.user, full_name='Banked', email='b@example.com', education='BTech',
+            skills='Python', role='Developer', mode='technical', num_questions=5,
+        )
+        self.session = InterviewSession.objects.create(user=self.user, interview_details=details, total_questions=5)
+        self.context = {'mode': 'technical', 'difficulty': 'medium', 'skills': 'Python, SQL', 'domain': 'IT'}
+
+    def add(self, text, rand_key, **fields):
+        question = make_bank_question(text, **fields)
+        question.rand_key = rand_key
+        question.save()
+        return question
+
+    def pick(self, point, queries=1):
+        with mock.patch('dashboard.question_bank.random.random', return_value=point):
+            with self.assertNumQueries(queries):
+                return pick_bank_question(self.user, self.context)
+
+    def test_lowest_key_past_the_point_across_pairs(self):
+        self.add('Python in IT?', 0.7, domain='it', skill_tag='python')
+        sql = self.add('SQL anywhere?', 0.5, skill_tag='sql')
+        self.add('Any skill in IT?', 0.6, domain='it')
+        self.add('Java?', 0.45, skill_tag='java')
+        self.add('Finance?', 0.45, domain='finance')
+        self.add('Hard?', 0.45, difficulty='hard')
+        self.assertEqual(self.pick(0.4), sql)
+
+    def test_wraps_around_and_skips_served_questions(self):
+        first = self.add('First?', 0.1, skill_tag='python')
+        second = self.add('Second?', 0.2)
+        self.assertEqual(self.pick(0.9, queries=2), first)
+
+        SessionQuestion.objects.create(session=self.session, question_number=2, question_text=first.text, bank_question=first)
+        self.assertEqual(self.pick(0.0), second)
+        SessionQuestion.objects.create(session=self.session, question_number=3, question_text=second.text, bank_question=second)
+        self.assertIsNone(self.pick(0.0, queries=2))
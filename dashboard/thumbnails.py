@@ -0,0 +1,92 @@
+"""
+Avatar-sized variants of profile pictures.
+
+sanitize_picture() re-encodes an upload before it is stored, applying the
+EXIF orientation and dropping the rest of its metadata (GPS included), so
+the original every variant is cut from, and that pages fall back to, is as
+clean as the variants. make_thumbnails() runs once when a picture is uploaded. JPEGs are decoded in
+draft mode (the decoder scales by 1/2-1/8 while reading, so a 12 MP phone
+photo never exists at full size in memory); the EXIF orientation is applied
+and everything else in the metadata, GPS included, is dropped. Square
+variants of THUMBNAIL_SIZES px are written as WebP (JPEG when Pillow lacks
+WebP) next to the content-addressed upload, so a picture several users
+share is only processed once. Templates pick a variant with the avatar_url
+filter (dashboard/templatetags/avatars.py).
+"""
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+
+from dashboard.storage import content_storage, derived_name, is_blob
+
+THUMBNAIL_SIZES = (64, 128, 256)
+
+
+def thumbnail_format():
+    from PIL import features
+
+    return ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+
+
+def sanitize_picture(upload):
+    """ContentFile with the upload's pixels, upright, without EXIF or other metadata"""
+    from PIL import Image, ImageOps
+
+    with Image.open(upload) as image:
+        image_format = image.format if image.format in ('JPEG', 'PNG', 'WEBP') else 'PNG'
+        icc_profile = image.info.get('icc_profile')
+        image = ImageOps.exif_transpose(image)
+        if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        out = BytesIO()
+        # Only the colour profile is carried over; without exif=... nothing else is written
+        options = {'icc_profile': icc_profile} if icc_profile else {}
+        if image_format == 'JPEG':
+            options.update(quality=90, optimize=True)
+        image.save(out, image_format, **options)
+    extension = {'JPEG': '.jpg', 'PNG': '.png', 'WEBP': '.webp'}[image_format]
+    return ContentFile(out.getvalue(), name=os.path.splitext(upload.name or 'picture')[0] + extension)
+
+
+def render_thumbnails(f, sizes=THUMBNAIL_SIZES, image_format='WEBP'):
+    """{size: encoded bytes} of square variants of the image in file f"""
+    from PIL import Image, ImageOps
+
+    sizes = sorted(sizes, reverse=True)
+    with Image.open(f) as image:
+        # Only JPEG honours draft(); it picks the smallest scale still >= the largest variant
+        image.draft('RGB', (sizes[0], sizes[0]))
+        image = ImageOps.exif_transpose(image)
+        keep_alpha = image_format == 'WEBP' and image.mode in ('RGBA', 'LA', 'P')
+        image = image.convert('RGBA' if keep_alpha else 'RGB')
+
+        variants = {}
+        for size in sizes:
+            # Each variant is cut from the previous, larger one rather than the original
+            image = ImageOps.fit(image, (size, size), Image.LANCZOS)
+            out = BytesIO()
+            # Saved without exif=..., so no metadata is carried over
+            if image_format == 'WEBP':
+                image.save(out, image_format, quality=80, method=4)
+            else:
+                image.save(out, image_format, quality=80, optimize=True, progressive=True)
+            variants[size] = out.getvalue()
+    return variants
+
+
+def make_thumbnails(field_file):
+    """Create the variants of a stored picture if missing; returns {str(size): name} for the profile"""
+    name = field_file.name
+    if not is_blob(name):
+        return {}
+    image_format, extension = thumbnail_format()
+    names = {str(size): derived_name(name, f"{size}.{extension}") for size in THUMBNAIL_SIZES}
+    if all(content_storage.exists(n) for n in names.values()):
+        return names
+
+    with content_storage.open(name, 'rb') as f:
+        variants = render_thumbnails(f, THUMBNAIL_SIZES, image_format)
+    for size, data in variants.items():
+        content_storage.save_derived(names[str(size)], ContentFile(data))
+    return names
@@ -0,0 +1,96 @@
+"""
+Time series of a user's sessions for the analytics charts.
+
+session_series() groups InterviewSession rows into day/week/month buckets in
+the database (one GROUP BY query, so the rows never reach Python), then
+reduces each series to at most max_points with Largest-Triangle-Three-Buckets:
+the first and last points are kept, and from every bucket in between the
+point forming the largest triangle with the previously kept point and the
+next bucket's average. Peaks and dips survive, so a 10,000-session history
+charts like the full data at the cost of a few hundred points.
+"""
+import numpy as np
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+
+from dashboard.models import InterviewSession
+
+BUCKETS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+DEFAULT_MAX_POINTS = 300
+MAX_POINTS_LIMIT = 1000
+
+
+def lttb_indices(x, y, threshold):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps out of len(x)"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # threshold - 2 buckets over the points between the first and the last;
+    # the last bucket's "next bucket" is the final point itself
+    edges = np.append(np.linspace(1, n - 1, threshold - 1).astype(int), n)
+    kept = np.empty(threshold, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+        cx = x[end:next_end].mean()
+        cy = y[end:next_end].mean()
+        ax, ay = x[a], y[a]
+        areas = np.abs((ax - cx) * (y[start:end] - ay) - (ax - x[start:end]) * (cy - ay))
+        a = start + int(areas.argmax())
+        kept[i + 1] = a
+    return kept
+
+
+def downsample(points, max_points):
+    """[[x, y], ...] reduced to at most max_points with LTTB"""
+    if len(points) <= max_points:
+        return points
+    x, y = zip(*points)
+    return [points[i] for i in lttb_indices(x, y, max_points)]
+
+
+def session_series(user_id, bucket='day', since=None, max_points=DEFAULT_MAX_POINTS):
+    """{'score', 'duration_minutes', 'questions_answered'}: [[epoch ms, value], ...] per bucket, plus the bucket count"""
+    sessions = InterviewSession.objects.filter(user_id=user_id)
+    if since is not None:
+        sessions = sessions.filter(started_at__gte=since)
+    duration = ExpressionWrapper(F('completed_at') - F('started_at'), output_field=DurationField())
+    rows = (
+        sessions
+        .annotate(period=BUCKETS[bucket]('started_at'))
+        .values('period')
+        .annotate(
+            sessions=Count('id'),
+            score=Avg('overall_confidence_score'),
+            duration=Sum(duration),
+            questions_answered=Sum('questions_answered'),
+        )
+        .order_by('period')
+    )
+
+    score, duration_minutes, questions_answered = [], [], []
+    for row in rows:
+        t = int(row['period'].timestamp() * 1000)
+        # Buckets whose sessions are all unscored have no score point rather than a zero
+        if row['score'] is not None:
+            score.append([t, round(row['score'], 1)])
+        minutes = row['duration'].total_seconds() / 60 if row['duration'] else 0
+        duration_minutes.append([t, round(minutes, 1)])
+        questions_answered.append([t, row['questions_answered'] or 0])
+
+    return {
+        'buckets': len(duration_minutes),
+        'series': {
+            'score': downsample(score, max_points),
+            'duration_minutes': downsample(duration_minutes, max_points),
+            'questions_answered': downsample(questions_answered, max_points),
+        },
+    }
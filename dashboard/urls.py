@@ -13,6 +13,7 @@ urlpatterns = [
     path('sessions/', views.my_sessions, name='my_sessions'),
     path('uploads/', views.uploaded_items, name='uploaded_items'),
     path('analytics/', views.analytics, name='analytics'),
+    path('analytics/series/', views.analytics_series, name='analytics_series'),
     path("category/",views.category_view , name="category"),
     
     path("interview_requirements/",views.interview_requirements_view , name="interview_requirements"),
@@ -25,9 +26,12 @@ urlpatterns = [
 
     path('ai_session/', views.ai_page_view, name='ai_page'),
     path('simple_interview/', views.simple_interview_view, name='simple_interview'),
+    path('simple_interview/feedback_stream/', views.simple_feedback_stream, name='simple_feedback_stream'),
     path('start_session/', views.start_interview_session, name='start_session'),
     path('generate_question/', views.generate_question, name='generate_question'),
+    path('generate_question_stream/', views.generate_question_stream, name='generate_question_stream'),
     path('submit_answer/', views.submit_answer, name='submit_answer'),
+    path('answer_feedback/<int:question_id>/', views.answer_feedback, name='answer_feedback'),
     path('evaluate_answer/', views.evaluate_answer, name='evaluate_answer'),  # Legacy support
     path('end_session/', views.end_interview_session, name='end_session'),
 ]
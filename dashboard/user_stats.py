@@ -0,0 +1,116 @@
+"""
+Per-user analytics totals, kept up to date as sessions change.
+
+The analytics page used to count, aggregate and then walk every
+InterviewSession of the user on each view. UserStats holds the same numbers
+(session count, score sum and count, best score, total duration) and is
+adjusted with F() expressions in the transaction that changes a session:
+record_session_started() when one is created, and tracking_session() around
+saves that end a session or (re)score it. Only the difference between the
+session's old and new duration/score is applied, so ending or re-scoring a
+session twice never counts it twice.
+
+A missing row is rebuilt from the sessions with a single aggregate query, as
+`manage.py rebuild_user_stats` does for every user after edits that bypass
+these hooks (admin changes, deleted sessions).
+"""
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from dashboard.models import InterviewSession, UserStats
+
+
+def session_duration(session):
+    if session.completed_at and session.started_at:
+        return session.completed_at - session.started_at
+    return timedelta(0)
+
+
+def aggregate_user_stats(user_id):
+    """Totals for one user computed from their sessions in one query"""
+    duration = ExpressionWrapper(F('completed_at') - F('started_at'), output_field=DurationField())
+    totals = InterviewSession.objects.filter(user_id=user_id).aggregate(
+        session_count=Count('id'),
+        scored_session_count=Count('overall_confidence_score'),
+        score_sum=Sum('overall_confidence_score'),
+        best_score=Max('overall_confidence_score'),
+        total_duration=Sum(duration),
+    )
+    totals['score_sum'] = totals['score_sum'] or 0
+    totals['total_duration'] = totals['total_duration'] or timedelta(0)
+    return totals
+
+
+def rebuild_user_stats(user_id):
+    """Recompute a user's UserStats row from scratch; returns it"""
+    stats, _ = UserStats.objects.update_or_create(
+        user_id=user_id,
+        defaults={**aggregate_user_stats(user_id), 'updated_at': timezone.now()},
+    )
+    return stats
+
+
+def get_user_stats(user_id):
+    try:
+        return UserStats.objects.get(user_id=user_id)
+    except UserStats.DoesNotExist:
+        # Users whose sessions predate the rollup
+        return rebuild_user_stats(user_id)
+
+
+def _apply(user_id, **changes):
+    # Call after the session row is written: a missing stats row is rebuilt
+    # from the sessions, which then already include this change
+    if not UserStats.objects.filter(user_id=user_id).update(**changes, updated_at=timezone.now()):
+        rebuild_user_stats(user_id)
+
+
+def record_session_started(user_id):
+    _apply(user_id, session_count=F('session_count') + 1)
+
+
+def record_session_change(session, previous_duration, previous_score):
+    """Add the change in session's duration and overall score since (previous_duration, previous_score)"""
+    changes = {}
+    duration_delta = session_duration(session) - previous_duration
+    if duration_delta:
+        changes['total_duration'] = F('total_duration') + duration_delta
+
+    score = session.overall_confidence_score
+    if score != previous_score:
+        if previous_score is None:
+            changes['scored_session_count'] = F('scored_session_count') + 1
+        elif score is None:
+            changes['scored_session_count'] = F('scored_session_count') - 1
+        changes['score_sum'] = F('score_sum') + ((score or 0) - (previous_score or 0))
+        if score is not None:
+            changes['best_score'] = Greatest(Coalesce(F('best_score'), Value(score)), Value(score))
+
+    if changes:
+        _apply(session.user_id, **changes)
+
+    if previous_score is not None and (score is None or score < previous_score):
+        # The lowered score may have been the best one; only then is the maximum looked up again
+        best = (
+            InterviewSession.objects
+            .filter(user_id=OuterRef('user_id'))
+            .values('user_id')
+            .annotate(best=Max('overall_confidence_score'))
+            .values('best')
+        )
+        UserStats.objects.filter(user_id=session.user_id, best_score=previous_score).update(best_score=Subquery(best))
+
+
+@contextmanager
+def tracking_session(session):
+    """Save session inside the block; its duration/score changes reach UserStats in the same transaction"""
+    previous_duration = session_duration(session)
+    previous_score = session.overall_confidence_score
+    with transaction.atomic():
+        yield session
+        record_session_change(session, previous_duration, previous_score)